@@ -82,10 +82,12 @@ echo ""
 # ============================================================================
 
 echo "[1/8] Verifying gcloud authentication..."
-if ! gcloud auth print-access-token >/dev/null 2>&1; then
+if ! GCLOUD_ACCESS_TOKEN=$(gcloud auth print-access-token 2>/dev/null); then
     echo "ERROR: Not authenticated with gcloud. Run 'gcloud auth login' first." >&2
     exit 1
 fi
+# Shared with the lib/ scripts so they don't each fork gcloud for a token
+export GCLOUD_ACCESS_TOKEN
 
 CURRENT_PROJECT=$(gcloud config get-value project 2>/dev/null || echo "")
 if [[ "$CURRENT_PROJECT" != "$PROJECT_ID" ]]; then
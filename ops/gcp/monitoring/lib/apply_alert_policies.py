@@ -1,103 +1,47 @@
 #!/usr/bin/env python3
 """
-Apply alert policies via gcloud alpha monitoring policies commands.
+Apply alert policies via GCP Cloud Monitoring API v3.
 
 Creates or updates alert policies based on rendered JSON templates.
-Uses gcloud CLI for operations.
+Uses gcloud auth for a single access token and makes REST API calls directly
+(see gcp_api.py).
 
-No external dependencies required.
+No external dependencies required (uses urllib from stdlib).
 """
 
 import json
 import os
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from gcp_api import (
+    apply_policy,
+    dedupe_policies,
+    find_existing_policies,
+    get_access_token,
+    load_state,
+    save_state,
+)
+from json_codec import validate_json
+from render_templates import read_template, render_template
 
-def run_gcloud(args: list, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a gcloud command and return the result."""
-    cmd = ["gcloud"] + args
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if check and result.returncode != 0:
-        print(f"gcloud error: {result.stderr}", file=sys.stderr)
-        raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
-    return result
 
-
-def list_alert_policies(project_id: str) -> list:
-    """List all alert policies in the project."""
-    result = run_gcloud([
-        "alpha", "monitoring", "policies", "list",
-        "--project", project_id,
-        "--format=json"
-    ])
-    if result.returncode != 0:
-        return []
-    try:
-        return json.loads(result.stdout) if result.stdout.strip() else []
-    except json.JSONDecodeError:
-        return []
-
-
-def find_policy_by_display_name(policies: list, display_name: str) -> dict:
-    """Find a policy by its displayName."""
-    for policy in policies:
-        if policy.get("displayName") == display_name:
-            return policy
-    return None
-
-
-def create_alert_policy(project_id: str, policy_file: Path) -> dict:
-    """Create a new alert policy from a JSON file."""
-    result = run_gcloud([
-        "alpha", "monitoring", "policies", "create",
-        "--project", project_id,
-        f"--policy-from-file={policy_file}",
-        "--format=json"
-    ])
-    return json.loads(result.stdout)
-
-
-def update_alert_policy(policy_name: str, policy_file: Path) -> dict:
-    """Update an existing alert policy."""
-    # gcloud alpha monitoring policies update requires the policy name
-    # and reads updates from the file
-    result = run_gcloud([
-        "alpha", "monitoring", "policies", "update",
-        policy_name,
-        f"--policy-from-file={policy_file}",
-        "--format=json"
-    ])
-    return json.loads(result.stdout)
-
-
-def render_alert_policy(template_path: Path, output_path: Path, variables: dict) -> None:
+def render_alert_policy(template_path: Path, output_path: Path, variables: dict) -> str:
     """Render an alert policy template with variables."""
-    with open(template_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = render_template(read_template(str(template_path)), variables)
     
-    for key, value in variables.items():
-        placeholder = "{{" + key + "}}"
-        content = content.replace(placeholder, str(value))
-    
-    # Validate JSON
+    # Validate JSON without keeping the parsed tree around
     try:
-        json.loads(content)
+        validate_json(content)
     except json.JSONDecodeError as e:
         print(f"ERROR: Invalid JSON in rendered template: {e}", file=sys.stderr)
         sys.exit(1)
     
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(content)
-
-
-def save_state(state_file: Path, state: dict) -> None:
-    """Save state to JSON file."""
-    state_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(state_file, 'w', encoding='utf-8') as f:
-        json.dump(state, f, indent=2)
-    print(f"State saved to: {state_file}")
+    
+    return content
 
 
 def main():
@@ -119,10 +63,9 @@ def main():
     generated_dir = script_dir / "generated"
     state_dir = script_dir / "state"
     
-    # List existing policies
-    print(f"Listing existing alert policies in project {project_id}...")
-    existing_policies = list_alert_policies(project_id)
-    print(f"Found {len(existing_policies)} existing alert policy(ies)")
+    # Get auth token once; every API call below reuses it
+    print("Getting access token...")
+    token = get_access_token()
     
     # Define policies to apply
     policies = [
@@ -142,49 +85,56 @@ def main():
         },
     ]
     
-    results = {}
-    
+    # Render templates up front (local I/O only); the API calls fan out below
+    rendered = {}
     for policy_config in policies:
         env = policy_config["env"]
-        template_path = templates_dir / policy_config["template"]
-        output_path = generated_dir / policy_config["output"]
-        display_name = policy_config["display_name"]
-        
-        # Render template
         variables = {
             "CHECK_ID": policy_config["check_id"],
             "CHANNEL_NAME": channel_name,
             "PROJECT_ID": project_id,
         }
-        
         print(f"\n[{env}] Rendering alert policy template...")
-        render_alert_policy(template_path, output_path, variables)
-        
-        # Check if already exists
-        existing = find_policy_by_display_name(existing_policies, display_name)
-        
-        if existing:
-            print(f"[{env}] Updating existing alert policy: {existing['name']}")
-            result = update_alert_policy(existing["name"], output_path)
-            action = "updated"
-        else:
-            print(f"[{env}] Creating new alert policy: {display_name}")
-            result = create_alert_policy(project_id, output_path)
-            action = "created"
-        
-        results[env] = {
-            "displayName": result.get("displayName", display_name),
-            "name": result.get("name", ""),
-            "enabled": result.get("enabled", True),
-            "notificationChannels": result.get("notificationChannels", []),
-            "action": action,
-        }
-        
-        print(f"  Name: {results[env]['name']}")
-        print(f"  Action: {action}")
+        rendered[env] = render_alert_policy(
+            templates_dir / policy_config["template"],
+            generated_dir / policy_config["output"],
+            variables,
+        )
     
-    # Save state
+    deduped = dedupe_policies(policies, rendered)
+    if len(deduped) < len(policies):
+        print(f"\nSkipped {len(policies) - len(deduped)} duplicate policy spec(s)")
+    policies = deduped
+    
+    # Resolve existing policies, preferring the names recorded on the last run
     state_file = state_dir / "alert_policies.json"
+    policies_by_name = find_existing_policies(policies, load_state(state_file), project_id, token)
+    
+    results = {}
+    
+    with ThreadPoolExecutor(max_workers=len(policies)) as executor:
+        futures = [
+            executor.submit(
+                apply_policy,
+                policy_config,
+                generated_dir / policy_config["output"],
+                policies_by_name,
+                project_id,
+                token,
+            )
+            for policy_config in policies
+        ]
+        for future in as_completed(futures):
+            env, result = future.result()
+            results[env] = result
+    
+    # Report and persist in declaration order regardless of completion order
+    results = {p["env"]: results[p["env"]] for p in policies}
+    for env, result in results.items():
+        print(f"\n[{env}] Name: {result['name']}")
+        print(f"[{env}] Action: {result['action']}")
+    
+    # Save state
     save_state(state_file, results)
     
     return results
@@ -1,77 +1,89 @@
 #!/usr/bin/env python3
 """
-Apply log-based metrics via gcloud logging metrics commands.
+Apply log-based metrics via GCP Cloud Logging API v2.
 
 Creates or updates log-based counter metrics that fire when specific log lines appear.
-Used for alerting self-test functionality.
+Used for alerting self-test functionality. Uses gcloud auth for a single access
+token and makes REST API calls directly.
 
-No external dependencies required.
+No external dependencies required (uses urllib from stdlib).
 """
 
-import json
 import os
-import subprocess
-import sys
-
-
-def run_gcloud(args: list, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a gcloud command and return the result."""
-    cmd = ["gcloud"] + args
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if check and result.returncode != 0:
-        print(f"gcloud error: {result.stderr}", file=sys.stderr)
-        raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
-    return result
-
-
-def list_log_metrics(project_id: str) -> list:
-    """List all log-based metrics in the project."""
-    result = run_gcloud([
-        "logging", "metrics", "list",
-        "--project", project_id,
-        "--format=json"
-    ], check=False)
-    if result.returncode != 0:
-        return []
-    try:
-        return json.loads(result.stdout) if result.stdout.strip() else []
-    except json.JSONDecodeError:
-        return []
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.error import HTTPError
+
+from gcp_api import LOGGING_API, api_request, get_access_token, log
 
 
-def find_metric_by_name(metrics: list, metric_name: str) -> dict:
-    """Find a metric by its name."""
-    for metric in metrics:
-        # The name field is like "projects/PROJECT_ID/metrics/METRIC_NAME"
-        if metric.get("name", "").endswith(f"/metrics/{metric_name}"):
-            return metric
-    return None
+def get_log_metric(project_id: str, metric_name: str, token: str) -> dict:
+    """Fetch a single log-based metric by name, or None if it doesn't exist."""
+    url = f"{LOGGING_API}/projects/{project_id}/metrics/{metric_name}"
+    try:
+        return api_request("GET", url, token)
+    except HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
 
 
-def create_log_metric(project_id: str, metric_name: str, filter_str: str, description: str) -> dict:
+def create_log_metric(project_id: str, token: str, metric_name: str, filter_str: str, description: str) -> dict:
     """Create a new log-based counter metric."""
-    run_gcloud([
-        "logging", "metrics", "create", metric_name,
-        "--project", project_id,
-        f"--log-filter={filter_str}",
-        f"--description={description}",
-        "--format=json"
-    ])
+    url = f"{LOGGING_API}/projects/{project_id}/metrics"
+    api_request("POST", url, token, {
+        "name": metric_name,
+        "filter": filter_str,
+        "description": description,
+    })
     return {"name": metric_name, "action": "created"}
 
 
-def update_log_metric(project_id: str, metric_name: str, filter_str: str, description: str) -> dict:
+def update_log_metric(project_id: str, token: str, metric_name: str, filter_str: str, description: str) -> dict:
     """Update an existing log-based metric."""
-    run_gcloud([
-        "logging", "metrics", "update", metric_name,
-        "--project", project_id,
-        f"--log-filter={filter_str}",
-        f"--description={description}",
-        "--format=json"
-    ])
+    url = f"{LOGGING_API}/projects/{project_id}/metrics/{metric_name}"
+    api_request("PUT", url, token, {
+        "name": metric_name,
+        "filter": filter_str,
+        "description": description,
+    })
     return {"name": metric_name, "action": "updated"}
 
 
+def apply_metric(metric_config: dict, project_id: str, token: str) -> tuple:
+    """Create or update one log-based metric.
+    
+    Safe to run concurrently for different metrics.
+    
+    Returns:
+        (metric_name, result_dict) tuple.
+    """
+    metric_name = metric_config["name"]
+    service_name = metric_config["service"]
+    description = metric_config["description"]
+    
+    # Build the filter for Cloud Run logs containing the trigger message
+    # Handles both textPayload and jsonPayload.message formats
+    filter_str = (
+        f'resource.type="cloud_run_revision" AND '
+        f'resource.labels.service_name="{service_name}" AND '
+        f'(textPayload:"ECHO_ALERT_TEST_TRIGGERED" OR jsonPayload.message="ECHO_ALERT_TEST_TRIGGERED")'
+    )
+    
+    # Metric names are fixed, so check for this one directly instead of
+    # listing every metric in the project
+    existing = get_log_metric(project_id, metric_name, token)
+    
+    if existing:
+        log(f"\n[{metric_name}] Updating existing log-based metric...")
+        result = update_log_metric(project_id, token, metric_name, filter_str, description)
+    else:
+        log(f"\n[{metric_name}] Creating new log-based metric...")
+        result = create_log_metric(project_id, token, metric_name, filter_str, description)
+    
+    log(f"[{metric_name}] Action: {result['action']}")
+    return metric_name, result
+
+
 def main():
     """Main entry point for applying log-based metrics."""
     project_id = os.environ.get("PROJECT_ID", "echo-staging-483002")
@@ -90,38 +102,23 @@ def main():
         },
     ]
     
-    # List existing metrics
-    print(f"Listing existing log-based metrics in project {project_id}...")
-    existing_metrics = list_log_metrics(project_id)
-    print(f"Found {len(existing_metrics)} existing log-based metric(s)")
+    # Get auth token once; every API call below reuses it
+    print("Getting access token...")
+    token = get_access_token()
     
     results = {}
     
-    for metric_config in metrics:
-        metric_name = metric_config["name"]
-        service_name = metric_config["service"]
-        description = metric_config["description"]
-        
-        # Build the filter for Cloud Run logs containing the trigger message
-        # Handles both textPayload and jsonPayload.message formats
-        filter_str = (
-            f'resource.type="cloud_run_revision" AND '
-            f'resource.labels.service_name="{service_name}" AND '
-            f'(textPayload:"ECHO_ALERT_TEST_TRIGGERED" OR jsonPayload.message="ECHO_ALERT_TEST_TRIGGERED")'
-        )
-        
-        # Check if metric already exists
-        existing = find_metric_by_name(existing_metrics, metric_name)
-        
-        if existing:
-            print(f"\n[{metric_name}] Updating existing log-based metric...")
-            result = update_log_metric(project_id, metric_name, filter_str, description)
-        else:
-            print(f"\n[{metric_name}] Creating new log-based metric...")
-            result = create_log_metric(project_id, metric_name, filter_str, description)
-        
-        results[metric_name] = result
-        print(f"  Action: {result['action']}")
+    with ThreadPoolExecutor(max_workers=len(metrics)) as executor:
+        futures = [
+            executor.submit(apply_metric, metric_config, project_id, token)
+            for metric_config in metrics
+        ]
+        for future in as_completed(futures):
+            metric_name, result = future.result()
+            results[metric_name] = result
+    
+    # Keep declaration order for the shell-facing output
+    results = {m["name"]: results[m["name"]] for m in metrics}
     
     # Output for shell script to capture
     print("\n--- LOG METRIC RESULTS ---")
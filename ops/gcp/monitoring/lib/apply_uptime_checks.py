@@ -8,48 +8,29 @@ uptime checks. Outputs check IDs for use in alert policies.
 No external dependencies required (uses urllib from stdlib).
 """
 
-import json
 import os
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.request import Request, urlopen
 from urllib.error import HTTPError
 
-
-def get_access_token() -> str:
-    """Get access token from gcloud auth."""
-    result = subprocess.run(
-        ["gcloud", "auth", "print-access-token"],
-        capture_output=True,
-        text=True,
-        check=True
-    )
-    return result.stdout.strip()
-
-
-def api_request(method: str, url: str, token: str, data: dict = None) -> dict:
-    """Make an authenticated API request to Cloud Monitoring."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    
-    body = json.dumps(data).encode('utf-8') if data else None
-    req = Request(url, data=body, headers=headers, method=method)
-    
-    try:
-        with urlopen(req) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except HTTPError as e:
-        error_body = e.read().decode('utf-8')
-        print(f"API Error ({e.code}): {error_body}", file=sys.stderr)
-        raise
+from gcp_api import (
+    ABSENT_STATUS_CODES,
+    MONITORING_API,
+    api_request,
+    get_access_token,
+    index_by_display_name,
+    load_state,
+    log,
+    save_state,
+    state_resource_name,
+)
+from json_codec import loads
 
 
 def list_uptime_checks(project_id: str, token: str) -> list:
     """List all existing uptime checks in the project."""
-    url = f"https://monitoring.googleapis.com/v3/projects/{project_id}/uptimeCheckConfigs"
+    url = f"{MONITORING_API}/projects/{project_id}/uptimeCheckConfigs"
     try:
         response = api_request("GET", url, token)
         return response.get("uptimeCheckConfigs", [])
@@ -59,23 +40,52 @@ def list_uptime_checks(project_id: str, token: str) -> list:
         raise
 
 
-def find_check_by_display_name(checks: list, display_name: str) -> dict:
-    """Find an uptime check by its displayName."""
-    for check in checks:
-        if check.get("displayName") == display_name:
-            return check
-    return None
+def get_uptime_check(name: str, token: str) -> dict:
+    """Fetch a single uptime check by resource name, or None if it is gone or not readable."""
+    url = f"{MONITORING_API}/{name}"
+    try:
+        return api_request("GET", url, token)
+    except HTTPError as e:
+        if e.code in ABSENT_STATUS_CODES:
+            return None
+        raise
+
+
+def find_existing_checks(environments: list, state: dict, project_id: str, token: str) -> dict:
+    """Resolve the managed uptime checks that already exist, keyed by displayName.
+    
+    Checks recorded in the state file for this project are fetched directly
+    by name. The project-wide list is only fetched when some check is not
+    covered by the state file (first run, or the check was deleted or renamed).
+    """
+    checks_by_name = {}
+    for env_name, _, display_name in environments:
+        check_name = state_resource_name(state, env_name, project_id)
+        if not check_name:
+            continue
+        check = get_uptime_check(check_name, token)
+        if check and check.get("displayName") == display_name:
+            checks_by_name[display_name] = check
+    
+    if len(checks_by_name) == len(environments):
+        print(f"Resolved {len(checks_by_name)} uptime check(s) from state file")
+        return checks_by_name
+    
+    print(f"Listing existing uptime checks in project {project_id}...")
+    existing_checks = list_uptime_checks(project_id, token)
+    print(f"Found {len(existing_checks)} existing uptime check(s)")
+    return {**index_by_display_name(existing_checks), **checks_by_name}
 
 
 def create_uptime_check(project_id: str, token: str, config: dict) -> dict:
     """Create a new uptime check."""
-    url = f"https://monitoring.googleapis.com/v3/projects/{project_id}/uptimeCheckConfigs"
+    url = f"{MONITORING_API}/projects/{project_id}/uptimeCheckConfigs"
     return api_request("POST", url, token, config)
 
 
 def update_uptime_check(name: str, token: str, config: dict) -> dict:
     """Update an existing uptime check."""
-    url = f"https://monitoring.googleapis.com/v3/{name}"
+    url = f"{MONITORING_API}/{name}"
     # Remove name from config for update
     config_copy = {k: v for k, v in config.items() if k != "name"}
     return api_request("PATCH", url, token, config_copy)
@@ -89,12 +99,43 @@ def extract_check_id(name: str) -> str:
     return name.split("/")[-1]
 
 
-def save_state(state_file: Path, state: dict) -> None:
-    """Save state to JSON file."""
-    state_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(state_file, 'w', encoding='utf-8') as f:
-        json.dump(state, f, indent=2)
-    print(f"State saved to: {state_file}")
+def apply_check(
+    env_name: str,
+    display_name: str,
+    config: dict,
+    checks_by_name: dict,
+    project_id: str,
+    token: str,
+) -> tuple:
+    """Create or update the uptime check for one environment.
+    
+    Safe to run concurrently for different environments.
+    
+    Returns:
+        (env_name, result_dict) tuple for the state file.
+    """
+    # Check if already exists
+    existing = checks_by_name.get(display_name)
+    
+    if existing:
+        log(f"[{env_name}] Updating existing uptime check: {existing['name']}")
+        result = update_uptime_check(existing["name"], token, config)
+        action = "updated"
+    else:
+        log(f"[{env_name}] Creating new uptime check: {display_name}")
+        result = create_uptime_check(project_id, token, config)
+        action = "created"
+    
+    return env_name, {
+        "displayName": result["displayName"],
+        "name": result["name"],
+        "check_id": extract_check_id(result["name"]),
+        "host": result["monitoredResource"]["labels"]["host"],
+        "path": result["httpCheck"]["path"],
+        "period": result["period"],
+        "timeout": result["timeout"],
+        "action": action,
+    }
 
 
 def main():
@@ -108,59 +149,53 @@ def main():
     print("Getting access token...")
     token = get_access_token()
     
-    # List existing checks
-    print(f"Listing existing uptime checks in project {project_id}...")
-    existing_checks = list_uptime_checks(project_id, token)
-    print(f"Found {len(existing_checks)} existing uptime check(s)")
-    
     # Process each environment
     environments = [
         ("staging", "uptime_check_staging.json", "Echo Backend STAGING - Health Check"),
         ("prod", "uptime_check_prod.json", "Echo Backend PROD - Health Check"),
     ]
     
-    results = {}
+    # Resolve existing checks, preferring the names recorded on the last run
+    state_file = state_dir / "uptime_checks.json"
+    checks_by_name = find_existing_checks(environments, load_state(state_file), project_id, token)
     
-    for env_name, config_file, display_name in environments:
+    # Load all configs before making any API calls so a missing file fails fast
+    configs = {}
+    for env_name, config_file, _ in environments:
         config_path = generated_dir / config_file
         if not config_path.exists():
             print(f"ERROR: Config file not found: {config_path}", file=sys.stderr)
             sys.exit(1)
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Check if already exists
-        existing = find_check_by_display_name(existing_checks, display_name)
-        
-        if existing:
-            print(f"\n[{env_name}] Updating existing uptime check: {existing['name']}")
-            result = update_uptime_check(existing["name"], token, config)
-            action = "updated"
-        else:
-            print(f"\n[{env_name}] Creating new uptime check: {display_name}")
-            result = create_uptime_check(project_id, token, config)
-            action = "created"
-        
-        check_id = extract_check_id(result["name"])
-        
-        results[env_name] = {
-            "displayName": result["displayName"],
-            "name": result["name"],
-            "check_id": check_id,
-            "host": result["monitoredResource"]["labels"]["host"],
-            "path": result["httpCheck"]["path"],
-            "period": result["period"],
-            "timeout": result["timeout"],
-            "action": action,
-        }
-        
-        print(f"  Name: {result['name']}")
-        print(f"  Check ID: {check_id}")
-        print(f"  Action: {action}")
+        configs[env_name] = loads(config_path.read_bytes())
+    
+    results = {}
+    
+    with ThreadPoolExecutor(max_workers=len(environments)) as executor:
+        futures = [
+            executor.submit(
+                apply_check,
+                env_name,
+                display_name,
+                configs[env_name],
+                checks_by_name,
+                project_id,
+                token,
+            )
+            for env_name, _, display_name in environments
+        ]
+        for future in as_completed(futures):
+            env_name, result = future.result()
+            results[env_name] = result
+    
+    # Report and persist in declaration order regardless of completion order
+    results = {env_name: results[env_name] for env_name, _, _ in environments}
+    for env_name, result in results.items():
+        print(f"\n[{env_name}] Name: {result['name']}")
+        print(f"[{env_name}] Check ID: {result['check_id']}")
+        print(f"[{env_name}] Action: {result['action']}")
     
     # Save state
-    state_file = state_dir / "uptime_checks.json"
     save_state(state_file, results)
     
     # Output for shell script consumption
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+GCP REST API helpers shared by the monitoring scripts.
+
+Covers auth, authenticated requests, state files and the alert policy
+operations used by both apply_alert_policies.py and
+apply_logmetric_policies.py.
+
+No external dependencies required (uses urllib from stdlib).
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+from json_codec import dumps, dumps_pretty, loads
+
+MONITORING_API = "https://monitoring.googleapis.com/v3"
+LOGGING_API = "https://logging.googleapis.com/v2"
+
+# Statuses that mean "no usable resource here" when probing by name: gone, or
+# not readable with these credentials (the state file may point elsewhere)
+ABSENT_STATUS_CODES = frozenset({403, 404})
+
+# Serializes output from worker threads
+_print_lock = threading.Lock()
+
+
+def log(*args, **kwargs) -> None:
+    """Print under a lock so concurrent workers don't interleave lines."""
+    with _print_lock:
+        print(*args, **kwargs)
+
+
+def get_access_token() -> str:
+    """Get access token from gcloud auth.
+    
+    Reuses GCLOUD_ACCESS_TOKEN when apply_monitoring.sh already fetched one,
+    so only standalone runs pay for a gcloud subprocess.
+    """
+    token = os.environ.get("GCLOUD_ACCESS_TOKEN", "").strip()
+    if token:
+        return token
+    
+    result = subprocess.run(
+        ["gcloud", "auth", "print-access-token"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return result.stdout.strip()
+
+
+def api_request(method: str, url: str, token: str, data: dict = None) -> dict:
+    """Make an authenticated request to a GCP REST API."""
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    }
+    
+    body = dumps(data) if data else None
+    req = Request(url, data=body, headers=headers, method=method)
+    
+    try:
+        with urlopen(req) as response:
+            return loads(response.read())
+    except HTTPError as e:
+        # Callers probing for a resource treat 404 as "absent"; don't report it
+        if e.code != 404:
+            error_body = e.read().decode('utf-8')
+            log(f"API Error ({e.code}): {error_body}", file=sys.stderr)
+        raise
+
+
+def index_by_display_name(resources: list) -> dict:
+    """Index resources by displayName so each lookup is a dict hit.
+    
+    Iterates in reverse so the first resource with a given displayName wins.
+    """
+    return {resource.get("displayName"): resource for resource in reversed(resources)}
+
+
+def state_resource_name(state: dict, env: str, project_id: str) -> str:
+    """Resource name recorded for env in the state file, or None.
+    
+    The state files are committed for the default project, so names from any
+    other project are ignored; a run with PROJECT_ID overridden then lists
+    and applies within its own project instead of touching the default one.
+    """
+    name = state.get(env, {}).get("name", "")
+    return name if name.startswith(f"projects/{project_id}/") else None
+
+
+def load_state(state_file: Path) -> dict:
+    """Load previously saved state, or an empty dict if there is none."""
+    try:
+        return loads(state_file.read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state_file: Path, state: dict) -> None:
+    """Save state to JSON file."""
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    # Encode once and write the bytes directly
+    state_file.write_bytes(dumps_pretty(state))
+    print(f"State saved to: {state_file}")
+
+
+def list_alert_policies(project_id: str, token: str) -> list:
+    """List all alert policies in the project, following pagination."""
+    base_url = f"{MONITORING_API}/projects/{project_id}/alertPolicies"
+    policies = []
+    page_token = ""
+    
+    while True:
+        url = base_url + (f"?pageToken={quote(page_token)}" if page_token else "")
+        try:
+            response = api_request("GET", url, token)
+        except HTTPError as e:
+            if e.code == 404:
+                return []
+            raise
+        policies.extend(response.get("alertPolicies", []))
+        page_token = response.get("nextPageToken", "")
+        if not page_token:
+            return policies
+
+
+def get_alert_policy(policy_name: str, token: str) -> dict:
+    """Fetch a single alert policy by resource name, or None if it is gone or not readable."""
+    try:
+        return api_request("GET", f"{MONITORING_API}/{policy_name}", token)
+    except HTTPError as e:
+        if e.code in ABSENT_STATUS_CODES:
+            return None
+        raise
+
+
+def find_existing_policies(policies: list, state: dict, project_id: str, token: str) -> dict:
+    """Resolve the managed policies that already exist, keyed by displayName.
+    
+    Policies recorded in the state file for this project are fetched directly
+    by name. The project-wide list is only paged through when some policy is
+    not covered by the state file (first run, or the policy was deleted or
+    renamed).
+    """
+    policies_by_name = {}
+    for policy_config in policies:
+        display_name = policy_config["display_name"]
+        policy_name = state_resource_name(state, policy_config["env"], project_id)
+        if not policy_name:
+            continue
+        policy = get_alert_policy(policy_name, token)
+        if policy and policy.get("displayName") == display_name:
+            policies_by_name[display_name] = policy
+    
+    if len(policies_by_name) == len(policies):
+        print(f"Resolved {len(policies_by_name)} alert policy(ies) from state file")
+        return policies_by_name
+    
+    print(f"Listing existing alert policies in project {project_id}...")
+    existing_policies = list_alert_policies(project_id, token)
+    print(f"Found {len(existing_policies)} existing alert policy(ies)")
+    return {**index_by_display_name(existing_policies), **policies_by_name}
+
+
+def load_policy(policy_file: Path) -> dict:
+    """Load a rendered alert policy JSON file."""
+    return loads(policy_file.read_bytes())
+
+
+def create_alert_policy(project_id: str, policy_file: Path, token: str) -> dict:
+    """Create a new alert policy from a JSON file."""
+    url = f"{MONITORING_API}/projects/{project_id}/alertPolicies"
+    return api_request("POST", url, token, load_policy(policy_file))
+
+
+def update_alert_policy(policy_name: str, policy_file: Path, token: str) -> dict:
+    """Update an existing alert policy.
+    
+    Without an updateMask the PATCH replaces the whole policy with the file contents.
+    """
+    url = f"{MONITORING_API}/{policy_name}"
+    # Remove name from config for update
+    policy = {k: v for k, v in load_policy(policy_file).items() if k != "name"}
+    return api_request("PATCH", url, token, policy)
+
+
+def policy_hash(content: str) -> str:
+    """Short content hash of a rendered policy, used to spot duplicate specs."""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def dedupe_policies(policies: list, rendered: dict) -> list:
+    """Drop policy specs that render to the same displayName and content.
+    
+    Args:
+        policies: Policy configs in declaration order.
+        rendered: Rendered policy JSON keyed by env.
+    
+    Returns:
+        The first spec for each (displayName, content hash) pair, in order.
+    """
+    seen = {}
+    return [
+        p for p in policies
+        if seen.setdefault((p["display_name"], policy_hash(rendered[p["env"]])), p) is p
+    ]
+
+
+# Fields the API fills in on every policy (and "name" on each condition);
+# they never appear in rendered templates, so comparisons skip them.
+_SERVER_POPULATED_KEYS = frozenset({"name", "creationRecord", "mutationRecord"})
+
+# proto3 default values; the API omits fields set to these from responses
+_PROTO3_DEFAULTS = (0, "", False, [], {})
+
+
+def matches_existing(desired, existing) -> bool:
+    """Check whether the live policy is exactly the rendered one.
+    
+    Both sides must have the same keys at every level, so a field removed
+    from a template still triggers an update. Server-populated fields are
+    ignored, and a rendered field holding a proto3 default (such as
+    "thresholdValue": 0) matches when the API leaves it out.
+    """
+    if isinstance(desired, dict):
+        if not isinstance(existing, dict):
+            return False
+        keys = desired.keys() - _SERVER_POPULATED_KEYS
+        if existing.keys() - _SERVER_POPULATED_KEYS - keys:
+            return False
+        return all(
+            matches_existing(desired[key], existing[key]) if key in existing
+            else desired[key] in _PROTO3_DEFAULTS
+            for key in keys
+        )
+    if isinstance(desired, list):
+        return (
+            isinstance(existing, list)
+            and len(desired) == len(existing)
+            and all(matches_existing(d, e) for d, e in zip(desired, existing))
+        )
+    return desired == existing
+
+
+def apply_policy(
+    policy_config: dict,
+    output_path: Path,
+    policies_by_name: dict,
+    project_id: str,
+    token: str,
+) -> tuple:
+    """Create or update one rendered alert policy.
+    
+    Safe to run concurrently for different environments.
+    
+    Returns:
+        (env, result_dict) tuple for the state file.
+    """
+    env = policy_config["env"]
+    display_name = policy_config["display_name"]
+    
+    # Check if already exists
+    existing = policies_by_name.get(display_name)
+    
+    if existing and matches_existing(load_policy(output_path), existing):
+        log(f"[{env}] Alert policy already up to date: {existing['name']}")
+        result = existing
+        action = "unchanged"
+    elif existing:
+        log(f"[{env}] Updating existing alert policy: {existing['name']}")
+        result = update_alert_policy(existing["name"], output_path, token)
+        action = "updated"
+    else:
+        log(f"[{env}] Creating new alert policy: {display_name}")
+        result = create_alert_policy(project_id, output_path, token)
+        action = "created"
+    
+    return env, {
+        "displayName": result.get("displayName", display_name),
+        "name": result.get("name", ""),
+        "enabled": result.get("enabled", True),
+        "notificationChannels": result.get("notificationChannels", []),
+        "action": action,
+    }
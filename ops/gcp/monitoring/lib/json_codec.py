@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+JSON encode/decode helpers shared by the monitoring scripts.
+
+Uses orjson when it is installed (much faster for large API responses and
+state files) and falls back to the stdlib json module otherwise, so the
+scripts still run with no external dependencies.
+
+orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+catching json.JSONDecodeError with either backend.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+if orjson is not None:
+    def loads(data):
+        """Parse JSON from str or bytes."""
+        return orjson.loads(data)
+    
+    def dumps(obj) -> bytes:
+        """Encode obj as compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+    
+    def dumps_pretty(obj) -> bytes:
+        """Encode obj as UTF-8 JSON bytes indented by two spaces."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    def loads(data):
+        """Parse JSON from str or bytes."""
+        return json.loads(data)
+    
+    def dumps(obj) -> bytes:
+        """Encode obj as compact UTF-8 JSON bytes."""
+        return json.dumps(obj).encode('utf-8')
+    
+    def dumps_pretty(obj) -> bytes:
+        """Encode obj as UTF-8 JSON bytes indented by two spaces."""
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def validate_json(content: str) -> None:
+    """Check that content is exactly one JSON document.
+    
+    orjson already rejects trailing data. The stdlib fallback uses raw_decode
+    so the check fails as soon as the document ends and anything other than
+    whitespace follows it.
+    
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON.
+    """
+    if orjson is not None:
+        orjson.loads(content)
+        return
+    
+    start = len(content) - len(content.lstrip())
+    _, end = _JSON_DECODER.raw_decode(content, start)
+    if content[end:].strip():
+        raise json.JSONDecodeError("Extra data", content, end)
@@ -10,42 +10,70 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from json_codec import validate_json
+
+_PLACEHOLDER_RE = re.compile(r'\{\{([A-Z_]+)\}\}')
+
+
+@lru_cache(maxsize=32)
+def read_template(path_str: str) -> str:
+    """Read a template file, caching the content so repeat renders hit disk once."""
+    return Path(path_str).read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=32)
+def compile_template(template_content: str) -> tuple:
+    """Split a template into alternating literal text and placeholder names.
+    
+    Even indexes hold literal text and odd indexes hold placeholder names,
+    e.g. ('{"id": "', 'CHECK_ID', '"}'). Cached per template so rendering the
+    same template for several environments only scans it once.
+    """
+    return tuple(_PLACEHOLDER_RE.split(template_content))
+
 
 def render_template(template_content: str, variables: dict) -> str:
-    """Replace {{PLACEHOLDER}} patterns with values from variables dict."""
-    result = template_content
-    for key, value in variables.items():
-        placeholder = "{{" + key + "}}"
-        result = result.replace(placeholder, str(value))
-    
-    # Check for any remaining unresolved placeholders
-    remaining = re.findall(r'\{\{([A-Z_]+)\}\}', result)
+    """Replace {{PLACEHOLDER}} patterns with values from variables dict.
+    
+    Fills the placeholder slots of the compiled template and joins once;
+    placeholders with no matching variable are left in place and reported
+    as a warning.
+    """
+    parts = list(compile_template(template_content))
+    remaining = []
+    
+    for i in range(1, len(parts), 2):
+        key = parts[i]
+        if key in variables:
+            parts[i] = str(variables[key])
+        else:
+            remaining.append(key)
+            parts[i] = "{{" + key + "}}"
+    
     if remaining:
         print(f"WARNING: Unresolved placeholders: {remaining}", file=sys.stderr)
     
-    return result
+    return "".join(parts)
 
 
 def render_file(template_path: Path, output_path: Path, variables: dict) -> None:
     """Read template file, render it, and write to output path."""
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    rendered = render_template(template_content, variables)
+    rendered = render_template(read_template(str(template_path)), variables)
     
     # Validate JSON if it's a JSON file
     if template_path.suffix == '.json':
         try:
-            json.loads(rendered)
+            validate_json(rendered)
         except json.JSONDecodeError as e:
             print(f"ERROR: Invalid JSON after rendering {template_path}: {e}", file=sys.stderr)
             sys.exit(1)
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(rendered)
+    output_path.write_bytes(rendered.encode('utf-8'))
     
     print(f"Rendered: {template_path.name} -> {output_path}")
 
@@ -86,12 +114,18 @@ def main():
         ("uptime_check_prod.template.json", "uptime_check_prod.json"),
     ]
     
+    # One directory scan instead of a stat per template
+    with os.scandir(templates_dir) as entries:
+        available = {entry.name for entry in entries if entry.is_file()}
+    to_render = [(t, o) for t, o in templates_to_render if t in available]
+    
+    # Warm the template cache with parallel reads; render_file then hits memory
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(read_template, [str(templates_dir / t) for t, _ in to_render]))
+    
     # Render base templates (channel and uptime checks - no CHECK_ID needed)
-    for template_name, output_name in templates_to_render:
-        template_path = templates_dir / template_name
-        if template_path.exists():
-            output_path = generated_dir / output_name
-            render_file(template_path, output_path, variables)
+    for template_name, output_name in to_render:
+        render_file(templates_dir / template_name, generated_dir / output_name, variables)
     
     print(f"\nBase templates rendered to: {generated_dir}")
     print("Note: Alert policy templates require CHECK_ID and CHANNEL_NAME,")
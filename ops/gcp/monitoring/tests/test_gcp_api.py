@@ -0,0 +1,76 @@
+"""Tests for the shared monitoring API helpers."""
+import copy
+import sys
+from pathlib import Path
+
+# The lib scripts import each other as top-level modules
+LIB_DIR = Path(__file__).resolve().parents[1] / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from gcp_api import matches_existing
+
+
+RENDERED_POLICY = {
+    "displayName": "Echo Backend STAGING - Uptime Failed",
+    "combiner": "OR",
+    "conditions": [
+        {
+            "displayName": "Uptime check failed for staging",
+            "conditionThreshold": {"comparison": "COMPARISON_LT", "thresholdValue": 1},
+        }
+    ],
+    "notificationChannels": ["projects/p/notificationChannels/1"],
+    "enabled": True,
+}
+
+
+def live_policy(**extra) -> dict:
+    """The rendered policy as the API returns it, with server-populated fields."""
+    policy = copy.deepcopy(RENDERED_POLICY)
+    policy["name"] = "projects/p/alertPolicies/123"
+    policy["creationRecord"] = {"mutateTime": "2025-01-01T00:00:00Z"}
+    policy["mutationRecord"] = {"mutateTime": "2025-01-02T00:00:00Z"}
+    policy["conditions"][0]["name"] = "projects/p/alertPolicies/123/conditions/456"
+    policy.update(extra)
+    return policy
+
+
+def test_matches_ignoring_server_populated_fields():
+    assert matches_existing(RENDERED_POLICY, live_policy()) is True
+
+
+def test_changed_field_does_not_match():
+    changed = copy.deepcopy(RENDERED_POLICY)
+    changed["conditions"][0]["conditionThreshold"]["thresholdValue"] = 2
+    
+    assert matches_existing(changed, live_policy()) is False
+
+
+def test_field_removed_from_template_does_not_match():
+    live = live_policy(documentation={"content": "old runbook", "mimeType": "text/markdown"})
+    
+    assert matches_existing(RENDERED_POLICY, live) is False
+
+
+def test_label_removed_from_template_does_not_match():
+    rendered = {**RENDERED_POLICY, "userLabels": {"env": "staging"}}
+    live = live_policy(userLabels={"env": "staging", "alert_type": "uptime"})
+    
+    assert matches_existing(rendered, live) is False
+
+
+def test_zero_threshold_omitted_by_api_matches():
+    rendered = copy.deepcopy(RENDERED_POLICY)
+    rendered["conditions"][0]["conditionThreshold"]["thresholdValue"] = 0
+    live = live_policy()
+    del live["conditions"][0]["conditionThreshold"]["thresholdValue"]
+    
+    assert matches_existing(rendered, live) is True
+
+
+def test_non_default_field_missing_from_live_does_not_match():
+    live = live_policy()
+    del live["conditions"][0]["conditionThreshold"]["thresholdValue"]
+    
+    assert matches_existing(RENDERED_POLICY, live) is False
@@ -0,0 +1,67 @@
+"""Tests for resolving existing resources from a state file."""
+import io
+import sys
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+
+# The lib scripts import each other as top-level modules
+LIB_DIR = Path(__file__).resolve().parents[1] / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+import apply_uptime_checks
+import gcp_api
+
+STAGING_STATE = {
+    "staging": {
+        "displayName": "Echo Backend STAGING - Uptime Failed",
+        "name": "projects/echo-staging-483002/alertPolicies/123",
+    }
+}
+POLICIES = [{"env": "staging", "display_name": "Echo Backend STAGING - Uptime Failed"}]
+CHECKS = [("staging", "uptime_staging.json", "Echo Backend STAGING - Uptime Failed")]
+
+
+def forbidden(url) -> HTTPError:
+    return HTTPError(url, 403, "Forbidden", {}, io.BytesIO(b"{}"))
+
+
+@pytest.fixture
+def requested_urls(monkeypatch):
+    """Record every GET; the policy named in the state file is forbidden."""
+    urls = []
+
+    def fake_api_request(method, url, token, data=None):
+        urls.append(url)
+        if url.endswith("/alertPolicies/123"):
+            raise forbidden(url)
+        return {}
+
+    monkeypatch.setattr(gcp_api, "api_request", fake_api_request)
+    monkeypatch.setattr(apply_uptime_checks, "api_request", fake_api_request)
+    return urls
+
+
+def test_state_name_from_other_project_is_ignored():
+    assert gcp_api.state_resource_name(STAGING_STATE, "staging", "echo-prod") is None
+    assert gcp_api.state_resource_name(STAGING_STATE, "staging", "echo-staging-483002") == (
+        "projects/echo-staging-483002/alertPolicies/123"
+    )
+
+
+def test_policies_from_other_project_state_list_target_project(requested_urls):
+    assert gcp_api.find_existing_policies(POLICIES, STAGING_STATE, "echo-prod", "t") == {}
+    assert requested_urls == [f"{gcp_api.MONITORING_API}/projects/echo-prod/alertPolicies"]
+
+
+def test_forbidden_policy_falls_back_to_listing(requested_urls):
+    gcp_api.find_existing_policies(POLICIES, STAGING_STATE, "echo-staging-483002", "t")
+    assert requested_urls[0].endswith("/alertPolicies/123")
+    assert requested_urls[-1].endswith("/projects/echo-staging-483002/alertPolicies")
+
+
+def test_checks_from_other_project_state_list_target_project(requested_urls):
+    assert apply_uptime_checks.find_existing_checks(CHECKS, STAGING_STATE, "echo-prod", "t") == {}
+    assert requested_urls == [f"{gcp_api.MONITORING_API}/projects/echo-prod/uptimeCheckConfigs"]
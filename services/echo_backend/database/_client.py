@@ -1,49 +1,79 @@
 import hashlib
-import json
+import itertools
 import os
+import threading
 import uuid
-from typing import Optional
+from functools import lru_cache
+from typing import List
 
 from google.cloud import firestore
 
-# Lazy-initialized Firestore client (avoid ADC errors at import time in CI)
-_db: Optional[firestore.Client] = None
+from utils.other.credentials import ensure_credentials_file
 
+# Number of Firestore clients to spread requests over (each has its own gRPC channel)
+_POOL_SIZE = max(1, int(os.environ.get('ECHO_FIRESTORE_POOL_SIZE', '1')))
 
-def _ensure_credentials_file() -> None:
-    """Write SERVICE_ACCOUNT_JSON to disk if present (one-time)."""
-    if os.environ.get('SERVICE_ACCOUNT_JSON'):
-        service_account_info = json.loads(os.environ["SERVICE_ACCOUNT_JSON"])
-        with open('google-credentials.json', 'w') as f:
-            json.dump(service_account_info, f)
+# Lazy-initialized Firestore client pool (avoid ADC errors at import time in CI)
+_db_pool: List[firestore.Client] = []
+_pool_lock = threading.Lock()
+_round_robin = itertools.count()
+
+
+def _init_pool() -> List[firestore.Client]:
+    """Create the client pool once, even if several threads race to it."""
+    global _db_pool
+    with _pool_lock:
+        if not _db_pool:
+            ensure_credentials_file()
+            _db_pool = [firestore.Client() for _ in range(_POOL_SIZE)]
+    return _db_pool
 
 
 def get_db() -> firestore.Client:
-    """Return the Firestore client, creating it lazily on first call."""
-    global _db
-    if _db is None:
-        _ensure_credentials_file()
-        _db = firestore.Client()
-    return _db
+    """Return a Firestore client, creating the pool lazily on first call.
+
+    With ECHO_FIRESTORE_POOL_SIZE > 1, clients are handed out round-robin.
+    """
+    pool = _db_pool or _init_pool()
+    if len(pool) == 1:
+        return pool[0]
+    return pool[next(_round_robin) % len(pool)]
+
+
+# Deployments with credentials available at startup can opt in to paying the
+# client bootstrap at import instead of on the first request.
+if os.environ.get('ECHO_FIRESTORE_EAGER_INIT') in {'1', 'true', 'True'}:
+    _init_pool()
 
 
 # Backward-compat alias – existing code imports `db` directly.
 # This is a lazy proxy that defers client creation until first attribute access.
 class _LazyDB:
     def __getattr__(self, name):
-        return getattr(get_db(), name)
+        value = getattr(get_db(), name)
+        if len(_db_pool) == 1:
+            # Single client: pin the attribute so later lookups skip this hook
+            setattr(self, name, value)
+        return value
 
 
-db = _LazyDB()
+# With an eagerly created single client there is nothing to defer: export it directly.
+db = _db_pool[0] if len(_db_pool) == 1 else _LazyDB()
 
 
 def get_users_uid():
-    users_ref = get_db().collection('users')
-    return [str(doc.id) for doc in users_ref.stream()]
+    # Empty projection: only document names come back, not full user documents
+    users_ref = get_db().collection('users').select([])
+    return [doc.id for doc in users_ref.stream()]
+
 
+@lru_cache(maxsize=8192)
+def document_id_from_seed(seed: str) -> str:
+    """Avoid repeating the same data.
 
-def document_id_from_seed(seed: str) -> uuid.UUID:
-    """Avoid repeating the same data"""
+    Memoized since the same seeds recur; the SHA-256 derivation must stay as
+    is because the IDs are persisted.
+    """
     seed_hash = hashlib.sha256(seed.encode('utf-8')).digest()
     generated_uuid = uuid.UUID(bytes=seed_hash[:16], version=4)
     return str(generated_uuid)
@@ -1,4 +1,4 @@
-import json
+import importlib
 import os
 
 import firebase_admin
@@ -6,43 +6,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from modal import Image, App, asgi_app, Secret
-from routers import (
-    workflow,
-    chat,
-    firmware,
-    plugins,
-    transcribe,
-    notifications,
-    speech_profile,
-    agents,
-    users,
-    trends,
-    sync,
-    apps,
-    custom_auth,
-    payment,
-    integration,
-    conversations,
-    memories,
-    mcp,
-    mcp_sse,
-    oauth,
-    auth,
-    action_items,
-    task_integrations,
-    integrations,
-    other,
-    developer,
-    updates,
-    calendar_meetings,
-    imports,
-    knowledge_graph,
-    wrapped,
-    folders,
-    brain,
-    brain_auth,
-)
 
+from utils.other.credentials import get_service_account_info
+from utils.other.health_check import HealthCheckInterceptor
 from utils.other.timeout import TimeoutMiddleware
 
 def _init_firebase_admin() -> None:
@@ -63,8 +29,8 @@ def _init_firebase_admin() -> None:
         if getattr(firebase_admin, "_apps", None):
             return
 
-        if os.environ.get('SERVICE_ACCOUNT_JSON'):
-            service_account_info = json.loads(os.environ["SERVICE_ACCOUNT_JSON"])
+        service_account_info = get_service_account_info()
+        if service_account_info is not None:
             cred = firebase_admin.credentials.Certificate(service_account_info)
             firebase_admin.initialize_app(cred)
         else:
@@ -85,6 +51,20 @@ app = FastAPI(
     separate_input_output_schemas=False,
 )
 
+# Middleware added later wraps middleware added earlier, so requests flow
+# CORS -> health probe interceptor -> timeout -> routers.
+methods_timeout = {
+    "GET": os.environ.get('HTTP_GET_TIMEOUT'),
+    "PUT": os.environ.get('HTTP_PUT_TIMEOUT'),
+    "PATCH": os.environ.get('HTTP_PATCH_TIMEOUT'),
+    "DELETE": os.environ.get('HTTP_DELETE_TIMEOUT'),
+}
+
+app.add_middleware(TimeoutMiddleware, methods_timeout=methods_timeout)
+
+# Answer /health, /healthz, /v1/health and /ws/health without routing or the timeout middleware
+app.add_middleware(HealthCheckInterceptor)
+
 # CORS configuration
 # Default origins allowlist for Echo Web UI (staging, prod, local dev)
 _DEFAULT_CORS_ORIGINS = (
@@ -106,56 +86,62 @@ app.add_middleware(
     max_age=600,  # Cache preflight for 10 minutes
 )
 
-app.include_router(transcribe.router)
-app.include_router(conversations.router)
-app.include_router(action_items.router)
-app.include_router(task_integrations.router)
-app.include_router(integrations.router)
-app.include_router(memories.router)
-app.include_router(chat.router)
-app.include_router(plugins.router)
-app.include_router(speech_profile.router)
-# app.include_router(screenpipe.router)
-app.include_router(notifications.router)
-app.include_router(workflow.router)
-app.include_router(integration.router)
-app.include_router(agents.router)
-app.include_router(users.router)
-app.include_router(trends.router)
-
-app.include_router(other.router)
-
-app.include_router(firmware.router)
-app.include_router(updates.router)
-app.include_router(sync.router)
-
-app.include_router(apps.router)
-app.include_router(custom_auth.router)
-app.include_router(calendar_meetings.router)
-app.include_router(oauth.router)  # Added oauth router (for Omi Apps)
-app.include_router(auth.router)  # Added auth router (for the main Omi App, this is the core auth router)
-
-
-app.include_router(payment.router)
-app.include_router(mcp.router)
-app.include_router(mcp_sse.router)
-app.include_router(developer.router)
-app.include_router(imports.router)
-app.include_router(wrapped.router)
-app.include_router(folders.router)
-app.include_router(knowledge_graph.router)
-app.include_router(brain.router, prefix="/v1/brain", tags=["brain"])
-app.include_router(brain_auth.router, prefix="/v1/auth", tags=["auth"])
-
+# (module, prefix, tags) in registration order; order matters for route
+# matching and for the generated OpenAPI contract.
+_ROUTERS = (
+    ("routers.transcribe", None, None),
+    ("routers.conversations", None, None),
+    ("routers.action_items", None, None),
+    ("routers.task_integrations", None, None),
+    ("routers.integrations", None, None),
+    ("routers.memories", None, None),
+    ("routers.chat", None, None),
+    ("routers.plugins", None, None),
+    ("routers.speech_profile", None, None),
+    # ("routers.screenpipe", None, None),
+    ("routers.notifications", None, None),
+    ("routers.workflow", None, None),
+    ("routers.integration", None, None),
+    ("routers.agents", None, None),
+    ("routers.users", None, None),
+    ("routers.trends", None, None),
+    ("routers.other", None, None),
+    ("routers.firmware", None, None),
+    ("routers.updates", None, None),
+    ("routers.sync", None, None),
+    ("routers.apps", None, None),
+    ("routers.custom_auth", None, None),
+    ("routers.calendar_meetings", None, None),
+    ("routers.oauth", None, None),  # oauth router (for Omi Apps)
+    ("routers.auth", None, None),  # auth router (for the main Omi App, this is the core auth router)
+    ("routers.payment", None, None),
+    ("routers.mcp", None, None),
+    ("routers.mcp_sse", None, None),
+    ("routers.developer", None, None),
+    ("routers.imports", None, None),
+    ("routers.wrapped", None, None),
+    ("routers.folders", None, None),
+    ("routers.knowledge_graph", None, None),
+    ("routers.brain", "/v1/brain", ["brain"]),
+    ("routers.brain_auth", "/v1/auth", ["auth"]),
+)
 
-methods_timeout = {
-    "GET": os.environ.get('HTTP_GET_TIMEOUT'),
-    "PUT": os.environ.get('HTTP_PUT_TIMEOUT'),
-    "PATCH": os.environ.get('HTTP_PATCH_TIMEOUT'),
-    "DELETE": os.environ.get('HTTP_DELETE_TIMEOUT'),
+# Comma-separated module names (e.g. "routers.payment,routers.mcp_sse") to leave
+# out entirely; their imports (and transitive SDK/DB clients) are never loaded.
+_DISABLED_ROUTERS = {
+    name.strip() for name in os.environ.get("ECHO_DISABLED_ROUTERS", "").split(",") if name.strip()
 }
 
-app.add_middleware(TimeoutMiddleware, methods_timeout=methods_timeout)
+for _module_name, _prefix, _tags in _ROUTERS:
+    if _module_name in _DISABLED_ROUTERS:
+        continue
+    _router_kwargs = {}
+    if _prefix:
+        _router_kwargs["prefix"] = _prefix
+    if _tags:
+        _router_kwargs["tags"] = _tags
+    app.include_router(importlib.import_module(_module_name).router, **_router_kwargs)
+
 
 modal_app = App(
     name='backend',
@@ -169,7 +155,10 @@ image = Image.debian_slim().apt_install('ffmpeg', 'git', 'unzip').pip_install_fr
     keep_warm=0,
     memory=(512, 1024),
     cpu=2,
-    allow_concurrent_inputs=10,
+    # The ASGI app is async and I/O-bound (Firestore, LLM calls), so one container
+    # can multiplex many requests. modal==0.64.7 predates @modal.concurrent; switch
+    # to max_inputs=100, target_inputs=30 when the pin is bumped.
+    allow_concurrent_inputs=100,
     timeout=60 * 10,
 )
 @asgi_app()
@@ -177,7 +166,5 @@ def api():
     return app
 
 
-paths = ['_temp', '_samples', '_segments', '_speech_profiles']
-for path in paths:
-    if not os.path.exists(path):
-        os.makedirs(path)
+for path in ('_temp', '_samples', '_segments', '_speech_profiles'):
+    os.makedirs(path, exist_ok=True)
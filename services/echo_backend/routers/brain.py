@@ -1,20 +1,20 @@
 """Brain API router for conversational intelligence endpoints."""
-import json
 import logging
 import os
-import uuid
+import sys
+from secrets import token_hex
 from typing import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 
 from models.brain import (
     BrainHealthResponse,
     ChatRequest,
     ChatResponse,
-    ErrorInfo,
-    ErrorResponse,
     RuntimeMetadata,
+    StreamEventType,
 )
 from utils.brain.provider import BrainProviderError, get_brain_provider, get_provider_name
 from utils.auth.brain_auth import require_brain_auth, BrainAuthResult
@@ -22,13 +22,35 @@ from utils.auth.brain_auth import require_brain_auth, BrainAuthResult
 logger = logging.getLogger(__name__)
 
 # Runtime metadata (set via Cloud Run env vars at deploy time)
-_APP_ENV = os.environ.get("APP_ENV", "unknown")
-_GIT_SHA = os.environ.get("GIT_SHA", "unknown")
-_BUILD_TIME = os.environ.get("BUILD_TIME", "unknown")
+_APP_ENV = sys.intern(os.environ.get("APP_ENV", "unknown"))
+_GIT_SHA = sys.intern(os.environ.get("GIT_SHA", "unknown"))
+_BUILD_TIME = sys.intern(os.environ.get("BUILD_TIME", "unknown"))
+
+# Static part of the runtime metadata. The provider is resolved per request
+# because the provider singleton can be reset (tests, config reloads).
+_RUNTIME_BASE = {
+    "env": _APP_ENV,
+    "git_sha": _GIT_SHA,
+    "build_time": _BUILD_TIME,
+}
 
 
 router = APIRouter()
 
+# Pre-encoded SSE framing ("event: <type>\ndata: " per known event type)
+_SSE_EVENT_PREFIX = b"event: "
+_SSE_DATA_PREFIX = b"\ndata: "
+_SSE_TERMINATOR = b"\n\n"
+_SSE_PREFIXES = {
+    event_type.value: _SSE_EVENT_PREFIX + event_type.value.encode() + _SSE_DATA_PREFIX
+    for event_type in StreamEventType
+}
+
+
+def _runtime_metadata(trace_id: str, provider_name: str) -> dict:
+    """Build the runtime metadata dict for a request from the static base."""
+    return {"trace_id": trace_id, "provider": provider_name, **_RUNTIME_BASE}
+
 
 @router.get("/health", response_model=BrainHealthResponse)
 async def brain_health():
@@ -38,7 +60,7 @@ async def brain_health():
         BrainHealthResponse with status, time, version, and active provider.
     """
     provider_name = get_provider_name()
-    return BrainHealthResponse(provider=provider_name)
+    return BrainHealthResponse.model_construct(provider=provider_name)
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -54,18 +76,12 @@ async def brain_chat(request: ChatRequest, auth: BrainAuthResult = Depends(requi
     Raises:
         HTTPException: With structured error details on failure.
     """
-    trace_id = str(uuid.uuid4())
+    trace_id = token_hex(16)
     provider_name = get_provider_name()
     msg_count = len(request.messages)
     
-    # Build runtime metadata
-    runtime = RuntimeMetadata(
-        trace_id=trace_id,
-        provider=provider_name,
-        env=_APP_ENV,
-        git_sha=_GIT_SHA,
-        build_time=_BUILD_TIME,
-    )
+    # Build runtime metadata (values are already strings; skip validation)
+    runtime = RuntimeMetadata.model_construct(**_runtime_metadata(trace_id, provider_name))
     
     # Log request (never log message contents for privacy)
     logger.info(f"ECHO_CHAT_REQUEST trace_id={trace_id} provider={provider_name} msg_count={msg_count}")
@@ -105,6 +121,14 @@ async def brain_chat(request: ChatRequest, auth: BrainAuthResult = Depends(requi
         raise HTTPException(status_code=500, detail=error_detail)
 
 
+def _sse_frame(event_type: str, data: dict) -> bytes:
+    """Encode one SSE frame: event line, data line, blank line."""
+    prefix = _SSE_PREFIXES.get(event_type)
+    if prefix is None:
+        prefix = _SSE_EVENT_PREFIX + event_type.encode() + _SSE_DATA_PREFIX
+    return b"".join((prefix, orjson.dumps(data), _SSE_TERMINATOR))
+
+
 def _error_code_to_status(code: str) -> int:
     """Map error codes to HTTP status codes."""
     mapping = {
@@ -134,7 +158,7 @@ async def brain_chat_stream(request: ChatRequest, auth: BrainAuthResult = Depend
         - final: complete response with metadata and runtime info
         - error: error information with ok=false and error code
     """
-    trace_id = str(uuid.uuid4())
+    trace_id = token_hex(16)
     provider_name = get_provider_name()
     msg_count = len(request.messages)
     
@@ -142,15 +166,9 @@ async def brain_chat_stream(request: ChatRequest, auth: BrainAuthResult = Depend
     logger.info(f"ECHO_CHAT_STREAM_REQUEST trace_id={trace_id} provider={provider_name} msg_count={msg_count}")
     
     # Build runtime metadata dict for inclusion in final event
-    runtime_metadata = {
-        "trace_id": trace_id,
-        "provider": provider_name,
-        "env": _APP_ENV,
-        "git_sha": _GIT_SHA,
-        "build_time": _BUILD_TIME,
-    }
+    runtime_metadata = _runtime_metadata(trace_id, provider_name)
     
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         """Generate SSE-formatted events."""
         try:
             provider = get_brain_provider()
@@ -165,11 +183,7 @@ async def brain_chat_stream(request: ChatRequest, auth: BrainAuthResult = Depend
                     event_data["runtime"] = runtime_metadata
                     event_data["ok"] = True
                 
-                # Format as SSE: event line, data line, blank line
-                sse_event = f"event: {event_type}\n"
-                sse_event += f"data: {json.dumps(event_data)}\n\n"
-                
-                yield sse_event
+                yield _sse_frame(event_type, event_data)
         except BrainProviderError as e:
             logger.error(f"ECHO_CHAT_STREAM_ERROR trace_id={trace_id} code={e.code} error={e.message}")
             error_data = {
@@ -181,7 +195,7 @@ async def brain_chat_stream(request: ChatRequest, auth: BrainAuthResult = Depend
                 },
                 "runtime": runtime_metadata,
             }
-            yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
+            yield _sse_frame("error", error_data)
         except Exception as e:
             logger.error(f"ECHO_CHAT_STREAM_ERROR trace_id={trace_id} error={str(e)}")
             # Send error event with runtime metadata
@@ -193,7 +207,7 @@ async def brain_chat_stream(request: ChatRequest, auth: BrainAuthResult = Depend
                 },
                 "runtime": runtime_metadata,
             }
-            yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
+            yield _sse_frame("error", error_data)
     
     return StreamingResponse(
         event_generator(),
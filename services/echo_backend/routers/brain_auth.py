@@ -10,23 +10,25 @@ Security features:
 """
 import logging
 import os
-import uuid
+import sys
+from secrets import token_hex
 
 import bcrypt
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 
 from models.auth import LoginRequest, LoginResponse
 from models.brain import RuntimeMetadata
 from utils.auth.jwt_handler import create_access_token
-from utils.auth.rate_limiter import login_rate_limiter, RateLimitExceeded
+from utils.auth.rate_limiter import login_rate_limiter
 from utils.auth.settings import get_auth_settings
 
 logger = logging.getLogger(__name__)
 
 # Runtime metadata (set via Cloud Run env vars at deploy time)
-_APP_ENV = os.environ.get("APP_ENV", "unknown")
-_GIT_SHA = os.environ.get("GIT_SHA", "unknown")
-_BUILD_TIME = os.environ.get("BUILD_TIME", "unknown")
+_APP_ENV = sys.intern(os.environ.get("APP_ENV", "unknown"))
+_GIT_SHA = sys.intern(os.environ.get("GIT_SHA", "unknown"))
+_BUILD_TIME = sys.intern(os.environ.get("BUILD_TIME", "unknown"))
 
 
 router = APIRouter()
@@ -34,30 +36,28 @@ router = APIRouter()
 
 def _get_client_ip(request: Request) -> str:
     """Extract client IP from request, handling proxies."""
-    # Cloud Run sets X-Forwarded-For
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        # First IP in the chain is the original client
-        return forwarded.split(",")[0].strip()
-    # Fallback to direct client
-    return request.client.host if request.client else "unknown"
+    # Cloud Run sets X-Forwarded-For; the first IP in the chain is the
+    # original client. Fall back to the direct client otherwise.
+    return (
+        request.headers.get("X-Forwarded-For", "").partition(",")[0].strip()
+        or (request.client.host if request.client else "unknown")
+    )
 
 
-def _verify_pin(pin: str, pin_hash: str) -> bool:
+def _verify_pin(pin: str, pin_hash: bytes) -> bool:
     """Verify PIN against bcrypt hash (timing-safe).
     
+    bcrypt is deliberately slow, so callers on the event loop should run this
+    in a worker thread.
+    
     Args:
         pin: Plain text PIN from user.
-        pin_hash: bcrypt hash from settings.
+        pin_hash: Encoded bcrypt hash, already format-checked by settings.
         
     Returns:
         True if PIN matches, False otherwise.
     """
-    try:
-        return bcrypt.checkpw(pin.encode("utf-8"), pin_hash.encode("utf-8"))
-    except (ValueError, TypeError):
-        # Invalid hash format or encoding error
-        return False
+    return bcrypt.checkpw(pin.encode("utf-8"), pin_hash)
 
 
 @router.post("/login", response_model=LoginResponse)
@@ -78,11 +78,11 @@ async def login(request: Request, body: LoginRequest):
         HTTPException 429: Rate limit exceeded
         HTTPException 503: Auth not configured
     """
-    trace_id = str(uuid.uuid4())
+    trace_id = token_hex(16)
     client_ip = _get_client_ip(request)
     
-    # Build runtime metadata
-    runtime = RuntimeMetadata(
+    # Build runtime metadata (values are already strings; skip validation)
+    runtime = RuntimeMetadata.model_construct(
         trace_id=trace_id,
         provider="auth",
         env=_APP_ENV,
@@ -93,45 +93,44 @@ async def login(request: Request, body: LoginRequest):
     # Log attempt (never log PIN for security)
     logger.info(f"AUTH_LOGIN_ATTEMPT trace_id={trace_id} client_ip={client_ip}")
     
-    # Check rate limit
-    try:
-        login_rate_limiter.check_and_increment(client_ip)
-    except RateLimitExceeded as e:
-        logger.warning(f"AUTH_RATE_LIMIT trace_id={trace_id} client_ip={client_ip} retry_after={e.retry_after_seconds}")
+    # Get settings
+    settings = get_auth_settings()
+    
+    # Check if auth is configured (a malformed hash counts as not configured)
+    if settings.pin_hash_bytes is None:
+        logger.error(f"AUTH_NOT_CONFIGURED trace_id={trace_id}")
         raise HTTPException(
-            status_code=429,
+            status_code=503,
             detail={
                 "ok": False,
                 "error": {
-                    "code": "rate_limit",
-                    "message": "Too many login attempts. Please try again later.",
-                    "retry_after": e.retry_after_seconds,
+                    "code": "auth_not_configured",
+                    "message": "Authentication is not configured on this server.",
                 },
                 "runtime": runtime.model_dump(),
             },
-            headers={"Retry-After": str(e.retry_after_seconds)},
         )
     
-    # Get settings
-    settings = get_auth_settings()
-    
-    # Check if auth is configured
-    if not settings.pin_hash:
-        logger.error(f"AUTH_NOT_CONFIGURED trace_id={trace_id}")
+    # Check rate limit
+    allowed, retry_after = login_rate_limiter.check_and_increment(client_ip)
+    if not allowed:
+        logger.warning(f"AUTH_RATE_LIMIT trace_id={trace_id} client_ip={client_ip} retry_after={retry_after}")
         raise HTTPException(
-            status_code=503,
+            status_code=429,
             detail={
                 "ok": False,
                 "error": {
-                    "code": "auth_not_configured",
-                    "message": "Authentication is not configured on this server.",
+                    "code": "rate_limit",
+                    "message": "Too many login attempts. Please try again later.",
+                    "retry_after": retry_after,
                 },
                 "runtime": runtime.model_dump(),
             },
+            headers={"Retry-After": str(retry_after)},
         )
     
-    # Verify PIN
-    if not _verify_pin(body.pin, settings.pin_hash):
+    # Verify PIN off the event loop so other requests aren't stalled by bcrypt
+    if not await run_in_threadpool(_verify_pin, body.pin, settings.pin_hash_bytes):
         logger.warning(f"AUTH_INVALID_PIN trace_id={trace_id} client_ip={client_ip}")
         raise HTTPException(
             status_code=401,
@@ -166,7 +165,7 @@ async def login(request: Request, body: LoginRequest):
     
     logger.info(f"AUTH_LOGIN_SUCCESS trace_id={trace_id} client_ip={client_ip}")
     
-    return LoginResponse(
+    return LoginResponse.model_construct(
         ok=True,
         token=token,
         expires_at=expires_at,
@@ -1,8 +1,10 @@
+import hmac
 import logging
 import os
 
+import orjson
 from fastapi import APIRouter, Header, HTTPException
-from fastapi.websockets import WebSocket
+from fastapi.responses import Response
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,25 @@ _APP_ENV = os.environ.get("APP_ENV", "unknown")
 _GIT_SHA = os.environ.get("GIT_SHA", "unknown")
 _BUILD_TIME = os.environ.get("BUILD_TIME", "unknown")
 
+# Every field is fixed at deploy time, so serialize the bodies once
+_VERSION_BODY = orjson.dumps({
+    "env": _APP_ENV,
+    "git_sha": _GIT_SHA,
+    "build_time": _BUILD_TIME,
+})
+_ROOT_BODY = orjson.dumps({
+    "service": "echo-backend",
+    "env": _APP_ENV,
+    "git_sha": _GIT_SHA,
+    "build_time": _BUILD_TIME,
+    "status": "ok",
+    "endpoints": [
+        "GET /health",
+        "GET /version",
+        "GET /docs",
+    ]
+})
+
 
 @router.get("/")
 async def root():
@@ -24,18 +45,7 @@ async def root():
     Returns helpful JSON instead of 404 for users who visit the base URL.
     Includes runtime metadata set at deploy time.
     """
-    return {
-        "service": "echo-backend",
-        "env": _APP_ENV,
-        "git_sha": _GIT_SHA,
-        "build_time": _BUILD_TIME,
-        "status": "ok",
-        "endpoints": [
-            "GET /health",
-            "GET /version",
-            "GET /docs",
-        ]
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @router.get("/version")
@@ -44,27 +54,7 @@ async def version():
     
     Returns environment, git SHA, and build timestamp.
     """
-    return {
-        "env": _APP_ENV,
-        "git_sha": _GIT_SHA,
-        "build_time": _BUILD_TIME,
-    }
-
-
-@router.api_route("/healthz", methods=["GET", "HEAD"])
-@router.api_route("/health", methods=["GET", "HEAD"])
-@router.api_route("/v1/health", methods=["GET", "HEAD"])
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "ok"}
-
-
-@router.websocket("/ws/health")
-async def ws_health(websocket: WebSocket):
-    """WebSocket health check endpoint (no auth)."""
-    await websocket.accept()
-    await websocket.send_json({"status": "ok"})
-    await websocket.close()
+    return Response(content=_VERSION_BODY, media_type="application/json")
 
 
 @router.get("/ops/alert-test")
@@ -83,8 +73,10 @@ async def ops_alert_test(x_alert_test_token: str = Header(None)):
             detail="ALERT_TEST_TOKEN not configured on server"
         )
     
-    # Validate provided token
-    if not x_alert_test_token or x_alert_test_token != _ALERT_TEST_TOKEN:
+    # Validate provided token (constant-time comparison)
+    if not x_alert_test_token or not hmac.compare_digest(
+        x_alert_test_token.encode("utf-8"), _ALERT_TEST_TOKEN.encode("utf-8")
+    ):
         raise HTTPException(
             status_code=403,
             detail="Invalid or missing X-Alert-Test-Token header"
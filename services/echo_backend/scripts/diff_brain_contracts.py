@@ -11,10 +11,11 @@ which values differ.
 """
 import os
 import sys
-import json
 from pathlib import Path
 from typing import Any, List, Tuple
 
+import orjson
+
 # Add backend root to path
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(BACKEND_ROOT))
@@ -25,53 +26,65 @@ os.environ["ECHO_DISABLE_MODEL_DOWNLOADS"] = "1"
 os.environ["ECHO_REQUIRE_SECRETS"] = "0"
 
 
+_MISSING = object()
+
+
 def json_pointer_diff(obj1: Any, obj2: Any, path: str = "") -> List[Tuple[str, Any, Any]]:
-    """Recursively compare two objects and return JSON-pointer paths that differ.
+    """Compare two objects and return JSON-pointer paths that differ.
+    
+    Walks an explicit stack instead of recursing, and skips any subtree that
+    compares equal as a whole, so unchanged branches cost one C-level
+    comparison. Differences are reported in the same depth-first, sorted-key
+    order as a recursive walk. Like ``==``, that shortcut treats values such
+    as ``1``, ``1.0`` and ``True`` as equal.
     
     Returns:
         List of (json_pointer, value_in_obj1, value_in_obj2) tuples.
     """
     diffs = []
-    
-    if type(obj1) != type(obj2):
-        diffs.append((path or "/", obj1, obj2))
-        return diffs
-    
-    if isinstance(obj1, dict):
-        all_keys = set(obj1.keys()) | set(obj2.keys())
-        for key in sorted(all_keys):
-            new_path = f"{path}/{key}"
-            if key not in obj1:
-                diffs.append((new_path, "<missing>", obj2[key]))
-            elif key not in obj2:
-                diffs.append((new_path, obj1[key], "<missing>"))
-            else:
-                diffs.extend(json_pointer_diff(obj1[key], obj2[key], new_path))
-    elif isinstance(obj1, list):
-        if len(obj1) != len(obj2):
-            diffs.append((f"{path}[len]", len(obj1), len(obj2)))
-        for i, (v1, v2) in enumerate(zip(obj1, obj2)):
-            diffs.extend(json_pointer_diff(v1, v2, f"{path}[{i}]"))
-    else:
-        if obj1 != obj2:
-            diffs.append((path, obj1, obj2))
+    stack = [(obj1, obj2, path)]
+    
+    while stack:
+        a, b, path = stack.pop()
+        if a is b or a == b:
+            continue
+        
+        if a is _MISSING or b is _MISSING:
+            diffs.append((path, "<missing>" if a is _MISSING else a, "<missing>" if b is _MISSING else b))
+        elif a.__class__ is not b.__class__:
+            diffs.append((path or "/", a, b))
+        elif isinstance(a, dict):
+            # Pushed in reverse so keys pop (and report) in sorted order
+            for key in sorted(a.keys() | b.keys(), reverse=True):
+                stack.append((a.get(key, _MISSING), b.get(key, _MISSING), f"{path}/{key}"))
+        elif isinstance(a, list):
+            if len(a) != len(b):
+                diffs.append((f"{path}[len]", len(a), len(b)))
+            for i in range(min(len(a), len(b)) - 1, -1, -1):
+                stack.append((a[i], b[i], f"{path}[{i}]"))
+        else:
+            diffs.append((path, a, b))
     
     return diffs
 
 
+def _preview(value: Any) -> str:
+    """Truncated display form of a diff value (display only, so key order is left as-is)."""
+    if isinstance(value, str):
+        return value[:80]
+    return orjson.dumps(value).decode()[:80]
+
+
 def compact_diff_summary(diffs: List[Tuple[str, Any, Any]], max_items: int = 50) -> str:
     """Generate a compact diff summary."""
     if not diffs:
         return "No differences found."
     
     lines = [f"Found {len(diffs)} differences:"]
-    for i, (path, v1, v2) in enumerate(diffs[:max_items]):
-        # Truncate values for readability
-        v1_str = json.dumps(v1, sort_keys=True)[:80] if not isinstance(v1, str) else v1[:80]
-        v2_str = json.dumps(v2, sort_keys=True)[:80] if not isinstance(v2, str) else v2[:80]
+    for path, v1, v2 in diffs[:max_items]:
         lines.append(f"  {path}")
-        lines.append(f"    committed: {v1_str}")
-        lines.append(f"    current:   {v2_str}")
+        lines.append(f"    committed: {_preview(v1)}")
+        lines.append(f"    current:   {_preview(v2)}")
     
     if len(diffs) > max_items:
         lines.append(f"  ... and {len(diffs) - max_items} more differences")
@@ -81,11 +94,11 @@ def compact_diff_summary(diffs: List[Tuple[str, Any, Any]], max_items: int = 50)
 
 def main() -> int:
     """Compare committed snapshot with current contract."""
-    from fastapi.testclient import TestClient
     from utils.brain.contract_snapshot import (
         build_brain_v1_contract,
         normalize_contract,
         compute_contract_hash,
+        serialize_contract,
     )
     
     # Import app after env vars are set
@@ -98,16 +111,10 @@ def main() -> int:
         return 1
     
     print("Loading committed snapshot...")
-    with open(snapshot_path) as f:
-        committed_snapshot = json.load(f)
+    committed_snapshot = orjson.loads(snapshot_path.read_bytes())
     
     print("Fetching current OpenAPI schema...")
-    client = TestClient(app)
-    response = client.get("/openapi.json")
-    if response.status_code != 200:
-        print(f"❌ Failed to fetch OpenAPI: HTTP {response.status_code}")
-        return 1
-    openapi_schema = response.json()
+    openapi_schema = app.openapi()
     
     print("Building and normalizing contracts...")
     current_contract = build_brain_v1_contract(openapi_schema)
@@ -115,21 +122,27 @@ def main() -> int:
     normalized_committed = normalize_contract(committed_snapshot)
     normalized_current = normalize_contract(current_contract)
     
-    committed_hash = compute_contract_hash(normalized_committed)
-    current_hash = compute_contract_hash(normalized_current)
+    # Serialize once: the same bytes are hashed and, on mismatch, dumped for debugging
+    committed_bytes = serialize_contract(normalized_committed)
+    current_bytes = serialize_contract(normalized_current)
+    
+    committed_hash = compute_contract_hash(committed_bytes)
+    current_hash = compute_contract_hash(current_bytes)
     
     print(f"\nCommitted hash: {committed_hash}")
     print(f"Current hash:   {current_hash}")
     
-    if committed_hash == current_hash:
+    # Canonical bytes are equal iff the contracts are; the structural walk only
+    # runs when there is a real difference to explain
+    if committed_bytes == current_bytes:
         print("\n✓ Contracts match!")
         return 0
     
     print("\n❌ Hash mismatch - computing diff...")
     
     # High-level comparison
-    committed_schemas = set(normalized_committed.get("components", {}).get("schemas", {}).keys())
-    current_schemas = set(normalized_current.get("components", {}).get("schemas", {}).keys())
+    committed_schemas = normalized_committed.get("components", {}).get("schemas", {}).keys()
+    current_schemas = normalized_current.get("components", {}).get("schemas", {}).keys()
     
     schemas_only_in_committed = committed_schemas - current_schemas
     schemas_only_in_current = current_schemas - committed_schemas
@@ -145,10 +158,8 @@ def main() -> int:
     
     # Save debug files
     debug_dir = Path("/tmp") if Path("/tmp").exists() else BACKEND_ROOT
-    with open(debug_dir / "diff_committed.json", "w") as f:
-        json.dump(normalized_committed, f, indent=2, sort_keys=True)
-    with open(debug_dir / "diff_current.json", "w") as f:
-        json.dump(normalized_current, f, indent=2, sort_keys=True)
+    (debug_dir / "diff_committed.json").write_bytes(committed_bytes)
+    (debug_dir / "diff_current.json").write_bytes(current_bytes)
     
     print(f"\nDebug files saved to: {debug_dir}")
     
@@ -21,9 +21,7 @@ differences that fail contract validation.
 See: docs/brain_versioning.md
 """
 import os
-import re
 import sys
-import json
 from pathlib import Path
 
 # Add backend root to path for imports
@@ -36,35 +34,16 @@ os.environ["ECHO_DISABLE_MODEL_DOWNLOADS"] = "1"
 os.environ["ECHO_REQUIRE_SECRETS"] = "0"
 
 
-def get_pinned_versions() -> dict:
-    """Parse requirements.txt to get pinned fastapi/pydantic versions."""
-    requirements_path = BACKEND_ROOT / "requirements.txt"
-    pinned = {}
-    
-    if requirements_path.exists():
-        pattern = re.compile(r'^(fastapi|pydantic)==([\d.]+)', re.IGNORECASE)
-        for line in requirements_path.read_text().splitlines():
-            match = pattern.match(line.strip())
-            if match:
-                pinned[match.group(1).lower()] = match.group(2)
-    
-    return pinned
-
-
 def check_version_parity() -> tuple:
     """Check if installed versions match requirements.txt.
     
     Returns:
         (is_ok, message) tuple
     """
-    import fastapi
-    import pydantic
+    from utils.brain.version_pins import get_installed_versions, get_pinned_versions
     
-    pinned = get_pinned_versions()
-    installed = {
-        "fastapi": fastapi.__version__,
-        "pydantic": pydantic.__version__,
-    }
+    pinned = get_pinned_versions(BACKEND_ROOT / "requirements.txt")
+    installed = get_installed_versions()
     
     mismatches = []
     for pkg, required_ver in pinned.items():
@@ -93,11 +72,11 @@ def check_version_parity() -> tuple:
     return True, f"✓ Version parity OK (fastapi=={installed['fastapi']}, pydantic=={installed['pydantic']})"
 
 
-from fastapi.testclient import TestClient
 from utils.brain.contract_snapshot import (
     build_brain_v1_contract,
     normalize_contract,
     compute_contract_hash,
+    serialize_contract,
 )
 
 
@@ -123,15 +102,8 @@ def main() -> int:
         
         print("\nGenerating Brain API v1 contract snapshot...")
         
-        # Get OpenAPI schema from running app
-        client = TestClient(app)
-        response = client.get("/openapi.json")
-        
-        if response.status_code != 200:
-            print(f"❌ Failed to fetch OpenAPI schema: HTTP {response.status_code}", file=sys.stderr)
-            return 1
-        
-        openapi_schema = response.json()
+        # Get OpenAPI schema straight from the app (same dict /openapi.json serves)
+        openapi_schema = app.openapi()
         
         # Build Brain API v1 contract
         contract = build_brain_v1_contract(openapi_schema)
@@ -139,16 +111,16 @@ def main() -> int:
         # Normalize for deterministic comparison
         normalized = normalize_contract(contract)
         
-        # Compute hash
-        contract_hash = compute_contract_hash(normalized)
+        # Serialize once; the snapshot file is exactly the hashed bytes plus a newline
+        contract_bytes = serialize_contract(normalized)
+        contract_hash = compute_contract_hash(contract_bytes)
         
         # Write to snapshot file
         snapshot_path = BACKEND_ROOT / "models" / "brain_contract_v1.json"
         snapshot_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(snapshot_path, "w", encoding="utf-8") as f:
-            json.dump(normalized, f, indent=2, sort_keys=True)
-            f.write("\n")  # Trailing newline for git cleanliness
+        # Trailing newline for git cleanliness
+        snapshot_path.write_bytes(contract_bytes + b"\n")
         
         print(f"✓ Snapshot written to: {snapshot_path.relative_to(BACKEND_ROOT)}")
         print(f"✓ Contract hash (SHA256): {contract_hash}")
@@ -6,8 +6,6 @@ FastAPI config as main.py to ensure schema parity with CI.
 """
 import sys
 import os
-import json
-import re
 from pathlib import Path
 
 # Setup paths
@@ -20,26 +18,12 @@ os.environ['ECHO_DISABLE_MODEL_DOWNLOADS'] = '1'
 os.environ['ECHO_REQUIRE_SECRETS'] = '0'
 
 
-def get_pinned_versions():
-    """Parse requirements.txt for pinned versions."""
-    req_path = BACKEND_ROOT / "requirements.txt"
-    pinned = {}
-    if req_path.exists():
-        pattern = re.compile(r'^(fastapi|pydantic)==([\d.]+)', re.IGNORECASE)
-        for line in req_path.read_text().splitlines():
-            m = pattern.match(line.strip())
-            if m:
-                pinned[m.group(1).lower()] = m.group(2)
-    return pinned
-
-
 def check_versions():
     """Verify installed versions match requirements.txt."""
-    import fastapi
-    import pydantic
+    from utils.brain.version_pins import get_installed_versions, get_pinned_versions
     
-    pinned = get_pinned_versions()
-    installed = {"fastapi": fastapi.__version__, "pydantic": pydantic.__version__}
+    pinned = get_pinned_versions(BACKEND_ROOT / "requirements.txt")
+    installed = get_installed_versions()
     
     mismatches = []
     for pkg, req in pinned.items():
@@ -61,17 +45,16 @@ def check_versions():
 
 
 def main():
-    import fastapi
-    import pydantic
+    from utils.brain.version_pins import get_installed_versions
     
-    print(f"Using fastapi=={fastapi.__version__}, pydantic=={pydantic.__version__}")
+    installed = get_installed_versions()
+    print(f"Using fastapi=={installed['fastapi']}, pydantic=={installed['pydantic']}")
     
     if not check_versions():
         return 1
     
     # Create minimal app with brain router only (same config as main.py)
     from fastapi import FastAPI
-    from fastapi.testclient import TestClient
     from routers import brain
     
     app = FastAPI(separate_input_output_schemas=False)
@@ -81,23 +64,21 @@ def main():
         build_brain_v1_contract,
         normalize_contract, 
         compute_contract_hash,
+        serialize_contract,
     )
     
     print("\nGenerating Brain API v1 contract snapshot...")
     
-    client = TestClient(app)
-    resp = client.get("/openapi.json")
-    openapi = resp.json()
+    openapi = app.openapi()
     
     contract = build_brain_v1_contract(openapi)
     normalized = normalize_contract(contract)
-    hash_val = compute_contract_hash(normalized)
+    contract_bytes = serialize_contract(normalized)
+    hash_val = compute_contract_hash(contract_bytes)
     
-    # Write snapshot
+    # Write snapshot (hashed bytes plus trailing newline)
     snapshot_path = BACKEND_ROOT / "models" / "brain_contract_v1.json"
-    with open(snapshot_path, "w", encoding="utf-8") as f:
-        json.dump(normalized, f, indent=2, sort_keys=True)
-        f.write("\n")
+    snapshot_path.write_bytes(contract_bytes + b"\n")
     
     print(f"✓ Snapshot: {snapshot_path.relative_to(BACKEND_ROOT)}")
     print(f"✓ Hash: {hash_val}")
@@ -0,0 +1,116 @@
+"""Shared pytest fixtures for backend unit tests."""
+import re
+
+import bcrypt
+import httpx
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+
+# Minimum bcrypt cost; security is irrelevant for test fixtures
+BCRYPT_TEST_ROUNDS = 4
+
+_httpx_response_json = httpx.Response.json
+
+# Runtime metadata every brain response carries; trace_id is 16 random bytes, hex-encoded
+_RUNTIME_KEYS = frozenset({"trace_id", "provider", "env", "git_sha", "build_time"})
+_TRACE_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
+def _orjson_response_json(self, **kwargs):
+    """httpx.Response.json decoded with orjson (stdlib json when kwargs are given)."""
+    if kwargs:
+        return _httpx_response_json(self, **kwargs)
+    return orjson.loads(self.content)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def orjson_response_json():
+    """Decode every TestClient response body with orjson for the session."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", _orjson_response_json)
+        yield
+
+
+@pytest.fixture(scope="session")
+def bcrypt_hash(pytestconfig):
+    """Return a function that bcrypt-hashes a PIN, memoized in .pytest_cache.
+
+    Hashes are keyed by (pin, rounds), so the KDF runs once per machine
+    rather than once per test session.
+    """
+    cache = pytestconfig.cache
+
+    def _hash(pin: str) -> str:
+        key = f"bcrypt/{BCRYPT_TEST_ROUNDS}/{pin}"
+        pin_hash = cache.get(key, None)
+        if pin_hash is None:
+            pin_hash = bcrypt.hashpw(pin.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_TEST_ROUNDS)).decode("utf-8")
+            cache.set(key, pin_hash)
+        return pin_hash
+
+    return _hash
+
+
+@pytest.fixture(scope="session")
+def assert_runtime_metadata():
+    """Return a function that checks a brain response's runtime metadata block."""
+
+    def _check(runtime: dict, provider: str = "stub") -> None:
+        assert _RUNTIME_KEYS <= runtime.keys()
+        assert _TRACE_ID_RE.fullmatch(runtime["trace_id"])
+        assert runtime["provider"] == provider
+
+    return _check
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_brain_provider():
+    """Use the stub brain provider for the whole session (set before main is imported)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("ECHO_BRAIN_PROVIDER", "stub")
+        yield
+
+
+@pytest.fixture(scope="session")
+def app(stub_brain_provider):
+    """The backend FastAPI app, imported once per session."""
+    from main import app
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Test client shared by the whole session.
+
+    The app registers no startup/shutdown handlers, so entering the client
+    once only buys a single event-loop portal reused by every request.
+    """
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def brain_app(stub_brain_provider):
+    """FastAPI app with the brain router only.
+
+    Same FastAPI config (separate_input_output_schemas=False), prefix and tags
+    as main.py, so its OpenAPI output matches the snapshot generator. Brain
+    endpoint tests use it to skip importing main (every other router and its
+    SDK clients) and the app-wide middleware stack.
+    """
+    from fastapi import FastAPI
+    from routers import brain
+
+    app = FastAPI(separate_input_output_schemas=False)
+    app.include_router(brain.router, prefix="/v1/brain", tags=["brain"])
+    return app
+
+
+@pytest.fixture(scope="session")
+def brain_client(brain_app):
+    """Test client for the brain-only app, shared by the whole session."""
+    with TestClient(brain_app) as c:
+        yield c
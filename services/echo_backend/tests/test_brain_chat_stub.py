@@ -1,26 +1,15 @@
 """Tests for Brain API chat endpoint using stub provider."""
-import pytest
-from fastapi.testclient import TestClient
 
 
-@pytest.fixture(autouse=True)
-def force_stub_provider(monkeypatch):
-    """Force stub provider for all brain tests."""
-    monkeypatch.setenv("ECHO_BRAIN_PROVIDER", "stub")
-
-
-def test_brain_chat_simple() -> None:
+def test_brain_chat_simple(brain_client, assert_runtime_metadata) -> None:
     """Test simple chat completion with stub provider."""
-    from main import app
-    
-    client = TestClient(app)
     payload = {
         "messages": [
             {"role": "user", "content": "Hello, Brain!"}
         ]
     }
     
-    resp = client.post("/v1/brain/chat", json=payload)
+    resp = brain_client.post("/v1/brain/chat", json=payload)
     
     assert resp.status_code == 200
     data = resp.json()
@@ -36,20 +25,11 @@ def test_brain_chat_simple() -> None:
     
     # Runtime metadata fields
     assert "runtime" in data
-    runtime = data["runtime"]
-    assert "trace_id" in runtime
-    assert len(runtime["trace_id"]) == 36  # UUID format
-    assert runtime["provider"] == "stub"
-    assert "env" in runtime
-    assert "git_sha" in runtime
-    assert "build_time" in runtime
+    assert_runtime_metadata(data["runtime"])
 
 
-def test_brain_chat_with_session_id() -> None:
+def test_brain_chat_with_session_id(brain_client) -> None:
     """Test chat with explicit session_id."""
-    from main import app
-    
-    client = TestClient(app)
     session_id = "test-session-123"
     payload = {
         "messages": [
@@ -58,18 +38,15 @@ def test_brain_chat_with_session_id() -> None:
         "session_id": session_id
     }
     
-    resp = client.post("/v1/brain/chat", json=payload)
+    resp = brain_client.post("/v1/brain/chat", json=payload)
     
     assert resp.status_code == 200
     data = resp.json()
     assert data["session_id"] == session_id
 
 
-def test_brain_chat_multiple_messages() -> None:
+def test_brain_chat_multiple_messages(brain_client) -> None:
     """Test chat with conversation history."""
-    from main import app
-    
-    client = TestClient(app)
     payload = {
         "messages": [
             {"role": "system", "content": "You are a helpful assistant."},
@@ -79,24 +56,21 @@ def test_brain_chat_multiple_messages() -> None:
         ]
     }
     
-    resp = client.post("/v1/brain/chat", json=payload)
+    resp = brain_client.post("/v1/brain/chat", json=payload)
     
     assert resp.status_code == 200
     data = resp.json()
     assert "4 messages" in data["message"]["content"]
 
 
-def test_brain_chat_with_metadata() -> None:
+def test_brain_chat_with_metadata(brain_client) -> None:
     """Test chat with custom metadata."""
-    from main import app
-    
-    client = TestClient(app)
     payload = {
         "messages": [{"role": "user", "content": "Test"}],
         "metadata": {"user_id": "test-user", "source": "api-test"}
     }
     
-    resp = client.post("/v1/brain/chat", json=payload)
+    resp = brain_client.post("/v1/brain/chat", json=payload)
     
     assert resp.status_code == 200
     data = resp.json()
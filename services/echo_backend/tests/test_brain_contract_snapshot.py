@@ -3,13 +3,13 @@
 This test ensures no breaking changes are introduced to Brain API v1 without
 creating a new version. The contract is frozen and must remain backward compatible.
 """
-import json
+import os
 import sys
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pytest
-from fastapi.testclient import TestClient
 
 # Ensure backend root is in sys.path for main import (import-safe from any CWD)
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
@@ -20,8 +20,21 @@ from utils.brain.contract_snapshot import (
     build_brain_v1_contract,
     normalize_contract,
     compute_contract_hash,
+    serialize_contract,
 )
 
+# Endpoints that make up Brain API v1
+_EXPECTED_V1_ENDPOINTS = frozenset({
+    "/v1/brain/health",
+    "/v1/brain/chat",
+    "/v1/brain/chat/stream",
+})
+
+
+def _diff_section(current: dict, committed: dict, key: str) -> set[str]:
+    """Names present in only one of ``current[key]`` / ``committed[key]``."""
+    return current.get(key, {}).keys() ^ committed.get(key, {}).keys()
+
 
 def json_pointer_diff(a: Any, b: Any, pointer: str = "") -> list[tuple[str, str, Any, Any]]:
     """Generate compact diff as list of (pointer, change_type, old, new) tuples."""
@@ -50,36 +63,56 @@ def json_pointer_diff(a: Any, b: Any, pointer: str = "") -> list[tuple[str, str,
     return diffs
 
 
-# Force stub provider for deterministic testing
-@pytest.fixture(autouse=True)
-def force_stub_provider(monkeypatch):
-    """Force stub provider for all tests."""
-    monkeypatch.setenv("ECHO_BRAIN_PROVIDER", "stub")
+@pytest.fixture(scope="module")
+def openapi_schema(brain_app):
+    """OpenAPI schema of the brain-only app (the dict /openapi.json serves, without the HTTP round trip)."""
+    schema = brain_app.openapi()
+    assert schema["openapi"].startswith("3.")
+    return schema
 
 
-@pytest.fixture
-def client():
-    """FastAPI test client with brain-only app.
-    
-    Uses a minimal app with only the brain router to ensure schema parity
-    with the snapshot generator. Both use the same FastAPI config
-    (separate_input_output_schemas=False) and router setup.
-    """
-    from fastapi import FastAPI
-    from routers import brain
-    
-    # Create minimal app with same config as main.py
-    app = FastAPI(separate_input_output_schemas=False)
-    app.include_router(brain.router, prefix="/v1/brain", tags=["brain"])
-    return TestClient(app)
+@pytest.fixture(scope="module")
+def normalized_current(openapi_schema):
+    """Current Brain API v1 contract, built and normalized once per module."""
+    return normalize_contract(build_brain_v1_contract(openapi_schema))
+
 
+@pytest.fixture(scope="module")
+def current_hash(normalized_current):
+    """Hash of the normalized current contract."""
+    return compute_contract_hash(normalized_current)
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def contract_snapshot_path():
     """Path to committed contract snapshot."""
     return BACKEND_ROOT / "models" / "brain_contract_v1.json"
 
 
+@pytest.fixture(scope="session")
+def committed_snapshot(contract_snapshot_path):
+    """Committed snapshot, parsed once per session."""
+    return orjson.loads(contract_snapshot_path.read_bytes())
+
+
+@pytest.fixture(scope="session")
+def snapshot_paths(committed_snapshot):
+    """Paths documented in the committed snapshot."""
+    return frozenset(committed_snapshot.get("paths", {}))
+
+
+@pytest.fixture(scope="session")
+def normalized_committed(committed_snapshot):
+    """Normalized committed snapshot (the file does not change during a run)."""
+    return normalize_contract(committed_snapshot)
+
+
+@pytest.fixture(scope="session")
+def committed_hash(normalized_committed):
+    """Hash of the normalized committed snapshot."""
+    return compute_contract_hash(normalized_committed)
+
+
 def test_contract_snapshot_exists(contract_snapshot_path):
     """Verify contract snapshot file exists."""
     assert contract_snapshot_path.exists(), (
@@ -88,7 +121,7 @@ def test_contract_snapshot_exists(contract_snapshot_path):
     )
 
 
-def test_brain_api_matches_snapshot(client, contract_snapshot_path):
+def test_brain_api_matches_snapshot(normalized_current, current_hash, normalized_committed, committed_hash):
     """Verify Brain API v1 contract matches committed snapshot.
     
     This test prevents breaking changes to v1 endpoints. If this test fails,
@@ -100,26 +133,6 @@ def test_brain_api_matches_snapshot(client, contract_snapshot_path):
     3. Documenting migration guide
     4. See: docs/brain_versioning.md
     """
-    # Load committed snapshot
-    with open(contract_snapshot_path) as f:
-        committed_snapshot = json.load(f)
-    
-    # Get current OpenAPI schema from running app
-    response = client.get("/openapi.json")
-    assert response.status_code == 200
-    openapi_schema = response.json()
-    
-    # Build current Brain API v1 contract using shared helper
-    current_contract = build_brain_v1_contract(openapi_schema)
-    
-    # Normalize both contracts using shared helper
-    normalized_committed = normalize_contract(committed_snapshot)
-    normalized_current = normalize_contract(current_contract)
-    
-    # Compute hashes using shared helper
-    committed_hash = compute_contract_hash(normalized_committed)
-    current_hash = compute_contract_hash(normalized_current)
-    
     # Build diagnostic info if hashes differ
     diagnostic = ""
     if current_hash != committed_hash:
@@ -135,16 +148,16 @@ def test_brain_api_matches_snapshot(client, contract_snapshot_path):
         # Get compact JSON pointer diff
         diffs = json_pointer_diff(normalized_committed, normalized_current)
         
-        # Save full contracts for debugging
-        debug_dir = Path("/tmp") if Path("/tmp").exists() else BACKEND_ROOT
-        committed_debug = debug_dir / "contract_committed.json"
-        current_debug = debug_dir / "contract_current.json"
-        with open(committed_debug, "w") as f:
-            json.dump(normalized_committed, f, indent=2, sort_keys=True)
-        with open(current_debug, "w") as f:
-            json.dump(normalized_current, f, indent=2, sort_keys=True)
+        changed_paths = _diff_section(normalized_current, normalized_committed, "paths")
+        changed_schemas = _diff_section(
+            normalized_current.get("components", {}), normalized_committed.get("components", {}), "schemas"
+        )
+        if changed_paths:
+            diagnostic += f"\nPaths added/removed: {sorted(changed_paths)}\n"
+        if changed_schemas:
+            diagnostic += f"\nSchemas added/removed: {sorted(changed_schemas)}\n"
         
-        diagnostic = f"\nCompact diff (first 20 changes):\n"
+        diagnostic += f"\nCompact diff (first 20 changes):\n"
         for ptr, change_type, old, new in diffs[:20]:
             if change_type == "added":
                 diagnostic += f"  + {ptr}\n"
@@ -158,9 +171,19 @@ def test_brain_api_matches_snapshot(client, contract_snapshot_path):
         if len(diffs) > 20:
             diagnostic += f"  ... and {len(diffs) - 20} more changes\n"
         
-        diagnostic += f"\nDebug files saved:\n"
-        diagnostic += f"  Committed: {committed_debug}\n"
-        diagnostic += f"  Current:   {current_debug}\n"
+        # Save full contracts for debugging (opt-in; the diff above is usually enough)
+        if os.getenv("ECHO_DUMP_CONTRACT_DIFF", "0") == "1":
+            debug_dir = Path("/tmp") if Path("/tmp").exists() else BACKEND_ROOT
+            committed_debug = debug_dir / "contract_committed.json"
+            current_debug = debug_dir / "contract_current.json"
+            committed_debug.write_bytes(serialize_contract(normalized_committed) + b"\n")
+            current_debug.write_bytes(serialize_contract(normalized_current) + b"\n")
+            
+            diagnostic += f"\nDebug files saved:\n"
+            diagnostic += f"  Committed: {committed_debug}\n"
+            diagnostic += f"  Current:   {current_debug}\n"
+        else:
+            diagnostic += "\nSet ECHO_DUMP_CONTRACT_DIFF=1 to save full contracts for debugging.\n"
     
     # Compare
     assert current_hash == committed_hash, (
@@ -187,22 +210,11 @@ def test_brain_api_matches_snapshot(client, contract_snapshot_path):
     )
 
 
-def test_all_brain_endpoints_in_snapshot(client, contract_snapshot_path):
+def test_all_brain_endpoints_in_snapshot(snapshot_paths):
     """Verify all v1 brain endpoints are documented in snapshot."""
-    with open(contract_snapshot_path) as f:
-        snapshot = json.load(f)
-    
-    snapshot_paths = set(snapshot.get("paths", {}).keys())
-    
-    # Expected v1 endpoints
-    expected_endpoints = {
-        "/v1/brain/health",
-        "/v1/brain/chat",
-        "/v1/brain/chat/stream",
-    }
-    
-    assert snapshot_paths == expected_endpoints, (
+    assert snapshot_paths == _EXPECTED_V1_ENDPOINTS, (
         f"Contract snapshot is missing or has extra endpoints.\n"
-        f"Expected: {expected_endpoints}\n"
-        f"Snapshot: {snapshot_paths}\n"
+        f"Expected: {sorted(_EXPECTED_V1_ENDPOINTS)}\n"
+        f"Snapshot: {sorted(snapshot_paths)}\n"
+        f"Differing: {sorted(snapshot_paths ^ _EXPECTED_V1_ENDPOINTS)}\n"
     )
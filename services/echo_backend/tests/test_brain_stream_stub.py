@@ -1,119 +1,93 @@
 """Tests for Brain API streaming endpoint using stub provider."""
-import json
-import pytest
-from fastapi.testclient import TestClient
+import re
+from typing import Iterator
 
+import orjson
 
-@pytest.fixture(autouse=True)
-def force_stub_provider(monkeypatch):
-    """Force stub provider for all brain tests."""
-    monkeypatch.setenv("ECHO_BRAIN_PROVIDER", "stub")
 
+# StreamingResponse(media_type="text/event-stream") with Starlette's default charset appended
+_SSE_CONTENT_TYPE = "text/event-stream; charset=utf-8"
 
-def test_brain_stream_format() -> None:
+# One SSE frame: "event: <type>\ndata: <json>" (frames are separated by a blank line).
+# Matched against the raw body so only event names are decoded; orjson reads the data bytes.
+_SSE_RE = re.compile(rb"^event:\s*(\w+)\ndata:\s*(.+)$", re.MULTILINE)
+
+
+def _iter_sse(body: bytes) -> Iterator[tuple[str, dict]]:
+    """Yield (event_type, data) pairs from an SSE body, parsing each frame on demand."""
+    for m in _SSE_RE.finditer(body):
+        yield m.group(1).decode("ascii"), orjson.loads(m.group(2))
+
+
+def test_brain_stream_format(brain_client, assert_runtime_metadata) -> None:
     """Test streaming response format (SSE)."""
-    from main import app
-    
-    client = TestClient(app)
     payload = {
         "messages": [{"role": "user", "content": "Stream test"}]
     }
     
-    with client.stream("POST", "/v1/brain/chat/stream", json=payload) as resp:
-        assert resp.status_code == 200
-        assert resp.headers["content-type"] == "text/event-stream; charset=utf-8"
-        
-        # Collect all events
-        events = []
-        for line in resp.iter_lines():
-            if line.startswith("event:"):
-                event_type = line.split(":", 1)[1].strip()
-            elif line.startswith("data:"):
-                data_json = line.split(":", 1)[1].strip()
-                data = json.loads(data_json)
-                events.append({"type": event_type, "data": data})
-        
-        # Should have token events + final event
-        assert len(events) > 0
-        
-        # Last event should be 'final'
-        final_event = events[-1]
-        assert final_event["type"] == "final"
-        assert "message" in final_event["data"]
-        assert final_event["data"]["message"]["role"] == "assistant"
-        
-        # Final event should include runtime metadata
-        assert final_event["data"]["ok"] is True
-        assert "runtime" in final_event["data"]
-        runtime = final_event["data"]["runtime"]
-        assert "trace_id" in runtime
-        assert len(runtime["trace_id"]) == 36  # UUID format
-        assert runtime["provider"] == "stub"
-        assert "env" in runtime
-        assert "git_sha" in runtime
-        assert "build_time" in runtime
+    # The stub stream completes immediately, so read the whole body at once
+    resp = brain_client.post("/v1/brain/chat/stream", json=payload)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == _SSE_CONTENT_TYPE
+    
+    events = list(_iter_sse(resp.content))
+    
+    # Should have token events + final event
+    assert len(events) > 0
+    
+    # Last event should be 'final'
+    final_type, final_data = events[-1]
+    assert final_type == "final"
+    assert "message" in final_data
+    assert final_data["message"]["role"] == "assistant"
+    
+    # Final event should include runtime metadata
+    assert final_data["ok"] is True
+    assert "runtime" in final_data
+    assert_runtime_metadata(final_data["runtime"])
 
 
-def test_brain_stream_tokens() -> None:
+def test_brain_stream_tokens(brain_client) -> None:
     """Test streaming emits token events."""
-    from main import app
-    
-    client = TestClient(app)
     payload = {
         "messages": [{"role": "user", "content": "Token test"}]
     }
     
-    with client.stream("POST", "/v1/brain/chat/stream", json=payload) as resp:
-        assert resp.status_code == 200
-        
-        token_events = []
-        final_event = None
-        
-        current_event = None
-        for line in resp.iter_lines():
-            if line.startswith("event:"):
-                current_event = line.split(":", 1)[1].strip()
-            elif line.startswith("data:") and current_event:
-                data_json = line.split(":", 1)[1].strip()
-                data = json.loads(data_json)
-                
-                if current_event == "token":
-                    token_events.append(data)
-                elif current_event == "final":
-                    final_event = data
-        
-        # Should have multiple token events
-        assert len(token_events) > 1
-        
-        # Each token event should have token and session_id
-        for token_event in token_events:
-            assert "token" in token_event
-            assert "session_id" in token_event
-        
-        # Should have final event
-        assert final_event is not None
-        assert "message" in final_event
-        assert "session_id" in final_event
+    resp = brain_client.post("/v1/brain/chat/stream", json=payload)
+    assert resp.status_code == 200
+    
+    token_count = 0
+    final_event = None
+    for event_type, data in _iter_sse(resp.content):
+        if event_type == "token":
+            # Each token event should have token and session_id
+            assert "token" in data
+            assert "session_id" in data
+            token_count += 1
+        elif event_type == "final":
+            final_event = data
+            break
+    
+    # Should have multiple token events
+    assert token_count > 1
+    
+    # Should have final event
+    assert final_event is not None
+    assert "message" in final_event
+    assert "session_id" in final_event
 
 
-def test_brain_stream_session_id() -> None:
+def test_brain_stream_session_id(brain_client) -> None:
     """Test streaming maintains session_id."""
-    from main import app
-    
-    client = TestClient(app)
     session_id = "stream-session-456"
     payload = {
         "messages": [{"role": "user", "content": "Session test"}],
         "session_id": session_id
     }
     
-    with client.stream("POST", "/v1/brain/chat/stream", json=payload) as resp:
-        assert resp.status_code == 200
-        
-        for line in resp.iter_lines():
-            if line.startswith("data:"):
-                data_json = line.split(":", 1)[1].strip()
-                data = json.loads(data_json)
-                
-                if "session_id" in data:
-                    assert data["session_id"] == session_id
+    resp = brain_client.post("/v1/brain/chat/stream", json=payload)
+    assert resp.status_code == 200
+    
+    for _, data in _iter_sse(resp.content):
+        if "session_id" in data:
+            assert data["session_id"] == session_id
@@ -36,6 +36,30 @@ def test_healthz_ok() -> None:
     assert resp.json() == {"status": "ok"}
 
 
+def test_health_and_v1_health_ok() -> None:
+    client = TestClient(app)
+    for path in ("/health", "/v1/health"):
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ok"}
+
+
+def test_healthz_head_has_empty_body() -> None:
+    client = TestClient(app)
+    resp = client.head("/healthz")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.content == b""
+
+
+def test_healthz_post_returns_405_with_allow() -> None:
+    client = TestClient(app)
+    resp = client.post("/healthz")
+    assert resp.status_code == 405
+    assert resp.headers["allow"] == "GET, HEAD"
+    assert resp.json() == {"detail": "Method Not Allowed"}
+
+
 def test_ws_health_ok() -> None:
     client = TestClient(app)
     with client.websocket_connect("/ws/health") as ws:
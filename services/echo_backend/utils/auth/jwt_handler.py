@@ -7,15 +7,80 @@ Tokens include:
     - exp: Expiration timestamp
     - jti: Unique token ID for auditing
 """
+import base64
+import hashlib
+import hmac
+import json
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from threading import Lock
 from typing import Optional
 
 import jwt
+from cachetools import TTLCache
+from jwt.algorithms import HMACAlgorithm
 
 from .settings import get_auth_settings
 
+_ALGORITHM = "HS256"
+_ALGORITHMS = [_ALGORITHM]
+_DECODE_OPTIONS = {
+    "require": ["sub", "iat", "exp", "jti"],
+    "verify_exp": True,
+    "verify_iat": True,
+}
+_hs256 = HMACAlgorithm(HMACAlgorithm.SHA256)
+_jwt_decode = jwt.decode
+
+# Encoded header segment, byte-identical to what jwt.encode emits for HS256
+_HEADER_SEGMENT = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+# Verified-token cache: clients present the same bearer token on every request
+_VERIFIED_CACHE_SIZE = 10_000
+_VERIFIED_CACHE_TTL_SECONDS = 30
+_verified_lock = Lock()
+
+
+@lru_cache(maxsize=4)
+def _signing_key(secret: str) -> bytes:
+    """Prepare the HS256 key bytes once per configured secret."""
+    return _hs256.prepare_key(secret)
+
+
+@lru_cache(maxsize=4)
+def _hmac_base(secret: str) -> hmac.HMAC:
+    """Keyed HMAC-SHA256 state; copied per signature so the key schedule runs once."""
+    return hmac.new(_signing_key(secret), digestmod=hashlib.sha256)
+
+
+@lru_cache(maxsize=4)
+def _verified_tokens(secret: str) -> TTLCache:
+    """Recently verified payloads for one secret, keyed by a token digest (never the raw token).
+    
+    Keying the cache by secret means a rotated secret starts from an empty cache.
+    """
+    return TTLCache(maxsize=_VERIFIED_CACHE_SIZE, ttl=_VERIFIED_CACHE_TTL_SECONDS)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url, as used for JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _sign_hs256(payload: dict, secret: str) -> str:
+    """Encode and sign an HS256 JWT.
+    
+    Equivalent to ``jwt.encode(payload, secret, algorithm="HS256")`` for the
+    fixed header used here; verification still goes through PyJWT.
+    """
+    signing_input = _HEADER_SEGMENT + b"." + _b64url(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    mac = _hmac_base(secret).copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
+
 
 class JWTError(Exception):
     """Base exception for JWT errors."""
@@ -32,9 +97,9 @@ class JWTInvalidError(JWTError):
     pass
 
 
-@dataclass
+@dataclass(frozen=True)
 class JWTPayload:
-    """Decoded JWT payload."""
+    """Decoded JWT payload (immutable; cached instances are shared between requests)."""
     sub: str
     iat: datetime
     exp: datetime
@@ -76,7 +141,7 @@ def create_access_token(
         "jti": jti,
     }
     
-    token = jwt.encode(payload, settings.jwt_secret, algorithm="HS256")
+    token = _sign_hs256(payload, settings.jwt_secret)
     return token, exp
 
 
@@ -98,20 +163,27 @@ def verify_access_token(token: str) -> JWTPayload:
     if not settings.jwt_secret:
         raise JWTInvalidError("AUTH_JWT_SECRET not configured")
     
+    # Tokens verified in the last few seconds skip the signature check; expiry
+    # is still enforced against the cached exp claim
+    verified = _verified_tokens(settings.jwt_secret)
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()[:16]
+    with _verified_lock:
+        cached = verified.get(cache_key)
+    if cached is not None:
+        if cached[1] <= time.time():
+            raise JWTExpiredError("Token has expired")
+        return cached[0]
+    
     try:
         # Strictly specify allowed algorithms to prevent algorithm confusion
-        payload = jwt.decode(
+        payload = _jwt_decode(
             token,
-            settings.jwt_secret,
-            algorithms=["HS256"],
-            options={
-                "require": ["sub", "iat", "exp", "jti"],
-                "verify_exp": True,
-                "verify_iat": True,
-            }
+            _signing_key(settings.jwt_secret),
+            algorithms=_ALGORITHMS,
+            options=_DECODE_OPTIONS,
         )
         
-        return JWTPayload(
+        result = JWTPayload(
             sub=payload["sub"],
             iat=datetime.fromtimestamp(payload["iat"], tz=timezone.utc),
             exp=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
@@ -121,3 +193,7 @@ def verify_access_token(token: str) -> JWTPayload:
         raise JWTExpiredError("Token has expired")
     except jwt.InvalidTokenError as e:
         raise JWTInvalidError(f"Invalid token: {e}")
+    
+    with _verified_lock:
+        verified[cache_key] = (result, payload["exp"])
+    return result
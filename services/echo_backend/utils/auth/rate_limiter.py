@@ -1,20 +1,28 @@
 """In-memory sliding window rate limiter for login attempts.
 
 Provides basic protection against brute-force PIN attacks.
-Uses a simple sliding window algorithm with per-IP tracking.
+Uses a sliding window counter with per-IP tracking: each client keeps a
+count for the current fixed window and the previous one, and the previous
+count is weighted by how much of it still overlaps the sliding window.
 
 Note: This is an in-memory implementation suitable for single-instance
 deployments. For multi-instance deployments, consider using Redis.
 """
+import math
 import time
-from collections import defaultdict
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import Dict, List
+from typing import Tuple
+
+from cachetools import TTLCache
 
 
 class RateLimitExceeded(Exception):
-    """Raised when rate limit is exceeded."""
+    """Raised when rate limit is exceeded.
+    
+    ``LoginRateLimiter.check_and_increment`` reports limits via its return
+    value; this remains available for callers that prefer to raise.
+    """
     
     def __init__(self, retry_after_seconds: int):
         self.retry_after_seconds = retry_after_seconds
@@ -26,53 +34,87 @@ class RateLimitConfig:
     """Configuration for rate limiting."""
     max_attempts: int = 10  # Maximum attempts allowed
     window_seconds: int = 600  # Time window (10 minutes)
+    max_clients: int = 10_000  # Tracked clients before least-recently-used eviction
 
 
 @dataclass
 class LoginRateLimiter:
-    """Sliding window rate limiter for login attempts.
+    """Sliding window counter rate limiter for login attempts.
     
-    Thread-safe implementation using a simple lock.
+    Thread-safe implementation using a simple lock. Each client is stored as
+    ``(window_id, current_count, previous_count)``, so memory and time per
+    check are O(1) regardless of how many attempts a client makes. The
+    effective count is ``previous_count * (1 - elapsed_fraction) +
+    current_count``, an approximation of a true sliding window that assumes
+    the previous window's attempts were evenly spread.
+    
+    Entries live in a TTLCache sized by ``config.max_clients`` so that a
+    flood of unique client IDs cannot grow memory without bound; an entry
+    stays alive for two windows because its count still weighs on the next
+    window. Time comes from ``time.monotonic``.
     
     Usage:
         limiter = LoginRateLimiter()
-        try:
-            limiter.check_and_increment("192.168.1.1")
-            # Process login attempt
-        except RateLimitExceeded as e:
-            # Return 429 with retry_after_seconds
+        ok, retry_after = limiter.check_and_increment("192.168.1.1")
+        if not ok:
+            # Return 429 with retry_after
+        # Process login attempt
     """
     config: RateLimitConfig = field(default_factory=RateLimitConfig)
-    _attempts: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    _attempts: TTLCache = field(init=False)
     _lock: Lock = field(default_factory=Lock)
     
-    def check_and_increment(self, client_id: str) -> None:
+    def __post_init__(self) -> None:
+        self._attempts = TTLCache(maxsize=self.config.max_clients, ttl=2 * self.config.window_seconds)
+    
+    def _counts(self, client_id: str, window_id: int) -> Tuple[int, int]:
+        """Return ``(current_count, previous_count)`` for a client, rotated to ``window_id``."""
+        entry = self._attempts.get(client_id)
+        if entry is None:
+            return 0, 0
+        entry_window, current, previous = entry
+        if entry_window == window_id:
+            return current, previous
+        if entry_window == window_id - 1:
+            return 0, current
+        return 0, 0
+    
+    def check_and_increment(self, client_id: str) -> Tuple[bool, int]:
         """Check rate limit and record attempt.
         
+        Returns a tuple rather than raising so the rejection path stays cheap
+        when a client is hammering the endpoint.
+        
         Args:
             client_id: Identifier for the client (typically IP address).
             
-        Raises:
-            RateLimitExceeded: If the client has exceeded the rate limit.
+        Returns:
+            ``(True, 0)`` if the attempt is allowed, otherwise
+            ``(False, retry_after_seconds)``.
         """
-        now = time.time()
-        window_start = now - self.config.window_seconds
+        window = self.config.window_seconds
+        max_attempts = self.config.max_attempts
+        now = time.monotonic()
+        window_id = int(now // window)
+        elapsed = now - window_id * window
         
         with self._lock:
-            # Clean up old attempts outside the window
-            self._attempts[client_id] = [
-                ts for ts in self._attempts[client_id] if ts > window_start
-            ]
+            current, previous = self._counts(client_id, window_id)
             
             # Check if limit exceeded
-            if len(self._attempts[client_id]) >= self.config.max_attempts:
-                # Calculate retry time based on oldest attempt in window
-                oldest = min(self._attempts[client_id])
-                retry_after = max(1, int(oldest + self.config.window_seconds - now + 1))
-                raise RateLimitExceeded(retry_after_seconds=retry_after)
+            if previous * (1 - elapsed / window) + current >= max_attempts:
+                if current < max_attempts:
+                    # Wait for the previous window's weight to decay enough
+                    wait = (1 - (max_attempts - current) / previous) * window - elapsed
+                else:
+                    # Wait out this window, then for this window's weight to decay
+                    wait = (window - elapsed) + (1 - max_attempts / current) * window
+                return False, max(1, math.ceil(wait))
             
-            # Record this attempt
-            self._attempts[client_id].append(now)
+            # Record this attempt (re-inserting refreshes the entry's TTL)
+            self._attempts[client_id] = (window_id, current + 1, previous)
+        
+        return True, 0
     
     def get_remaining_attempts(self, client_id: str) -> int:
         """Get remaining attempts for a client.
@@ -83,14 +125,16 @@ class LoginRateLimiter:
         Returns:
             Number of remaining attempts in the current window.
         """
-        now = time.time()
-        window_start = now - self.config.window_seconds
+        window = self.config.window_seconds
+        now = time.monotonic()
+        window_id = int(now // window)
+        elapsed = now - window_id * window
         
         with self._lock:
-            recent_attempts = [
-                ts for ts in self._attempts[client_id] if ts > window_start
-            ]
-            return max(0, self.config.max_attempts - len(recent_attempts))
+            current, previous = self._counts(client_id, window_id)
+        
+        effective = previous * (1 - elapsed / window) + current
+        return max(0, math.ceil(self.config.max_attempts - effective))
     
     def reset(self, client_id: str) -> None:
         """Reset rate limit for a client (e.g., after successful login).
@@ -105,19 +149,21 @@ class LoginRateLimiter:
         """Clean up stale entries to prevent memory growth.
         
         Args:
-            max_age_seconds: Remove entries older than this. Default: 1 hour.
+            max_age_seconds: Remove entries whose latest possible attempt is
+                older than this. Default: 1 hour.
             
         Returns:
             Number of entries removed.
         """
-        now = time.time()
-        cutoff = now - max_age_seconds
+        window = self.config.window_seconds
+        cutoff = time.monotonic() - max_age_seconds
         removed = 0
         
         with self._lock:
+            self._attempts.expire()
             stale_keys = [
-                key for key, timestamps in self._attempts.items()
-                if not timestamps or max(timestamps) < cutoff
+                key for key, (window_id, _, _) in self._attempts.items()
+                if (window_id + 1) * window < cutoff
             ]
             for key in stale_keys:
                 del self._attempts[key]
@@ -10,9 +10,20 @@ Environment Variables:
     AUTH_TOKEN_TTL_SECONDS: JWT token lifetime in seconds. Default: 43200 (12 hours)
 """
 import os
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from functools import lru_cache
 
+# Modular Crypt Format bcrypt hash: $2a$/$2b$/$2y$, two-digit cost, 53 chars of salt+digest
+_BCRYPT_HASH_RE = re.compile(r"\$2[aby]\$(0[4-9]|[12][0-9]|3[01])\$[./A-Za-z0-9]{53}")
+
+
+def _encode_pin_hash(pin_hash: str | None) -> bytes | None:
+    """Return the PIN hash as bcrypt-ready bytes, or None if absent or malformed."""
+    if pin_hash and _BCRYPT_HASH_RE.fullmatch(pin_hash):
+        return pin_hash.encode("utf-8")
+    return None
+
 
 @dataclass(frozen=True)
 class AuthSettings:
@@ -22,6 +33,8 @@ class AuthSettings:
     jwt_secret: str | None
     pin_hash: str | None
     token_ttl_seconds: int
+    # Pre-encoded, format-checked pin_hash; None means PIN login is unavailable
+    pin_hash_bytes: bytes | None = field(default=None, repr=False)
     
     def validate(self) -> None:
         """Validate settings consistency.
@@ -45,7 +58,7 @@ class AuthSettings:
                     "AUTH_JWT_SECRET must be at least 32 characters for security."
                 )
             # Validate bcrypt hash format
-            if not self.pin_hash.startswith(('$2a$', '$2b$', '$2y$')):
+            if _encode_pin_hash(self.pin_hash) is None:
                 raise ValueError(
                     "AUTH_PIN_HASH must be a valid bcrypt hash (starts with $2a$, $2b$, or $2y$)."
                 )
@@ -75,11 +88,13 @@ def get_auth_settings() -> AuthSettings:
     except ValueError:
         raise ValueError("AUTH_TOKEN_TTL_SECONDS must be a valid integer")
     
+    pin_hash = os.environ.get("AUTH_PIN_HASH")
     settings = AuthSettings(
         auth_required=auth_required,
         jwt_secret=os.environ.get("AUTH_JWT_SECRET"),
-        pin_hash=os.environ.get("AUTH_PIN_HASH"),
+        pin_hash=pin_hash,
         token_ttl_seconds=token_ttl,
+        pin_hash_bytes=_encode_pin_hash(pin_hash),
     )
     settings.validate()
     return settings
@@ -6,7 +6,9 @@ normalization logic, preventing drift between generated and validated contracts.
 """
 import json
 import hashlib
-from typing import Dict, Any, Set
+from typing import Dict, Any, Set, Union
+
+import orjson
 
 
 def build_brain_v1_contract(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -60,11 +62,11 @@ def build_brain_v1_contract(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
     # Recursively collect nested schema refs
     def collect_nested_schemas(schema_name: str, seen: Set[str]) -> None:
         """Recursively collect schemas referenced by this schema."""
-        if schema_name in seen or schema_name not in openapi_schema.get("components", {}).get("schemas", {}):
+        if schema_name in seen or schema_name not in all_components:
             return
         
         seen.add(schema_name)
-        schema_obj = openapi_schema["components"]["schemas"][schema_name]
+        schema_obj = all_components[schema_name]
         
         # Check properties for refs
         for prop_spec in schema_obj.get("properties", {}).values():
@@ -72,7 +74,7 @@ def build_brain_v1_contract(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
             if ref:
                 nested_name = ref.split("/")[-1]
                 if nested_name not in brain_schemas:
-                    brain_schemas[nested_name] = openapi_schema["components"]["schemas"][nested_name]
+                    brain_schemas[nested_name] = all_components[nested_name]
                     collect_nested_schemas(nested_name, seen)
             
             # Check anyOf refs
@@ -81,7 +83,7 @@ def build_brain_v1_contract(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
                 if ref:
                     nested_name = ref.split("/")[-1]
                     if nested_name not in brain_schemas:
-                        brain_schemas[nested_name] = openapi_schema["components"]["schemas"][nested_name]
+                        brain_schemas[nested_name] = all_components[nested_name]
                         collect_nested_schemas(nested_name, seen)
             
             # Check array items refs
@@ -90,7 +92,7 @@ def build_brain_v1_contract(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
             if ref:
                 nested_name = ref.split("/")[-1]
                 if nested_name not in brain_schemas:
-                    brain_schemas[nested_name] = openapi_schema["components"]["schemas"][nested_name]
+                    brain_schemas[nested_name] = all_components[nested_name]
                     collect_nested_schemas(nested_name, seen)
     
     seen_schemas: Set[str] = set()
@@ -99,7 +101,6 @@ def build_brain_v1_contract(openapi_schema: Dict[str, Any]) -> Dict[str, Any]:
     
     # Always include FastAPI's standard validation error schemas if present
     # These are automatically added for 422 responses by FastAPI/Pydantic
-    all_components = openapi_schema.get("components", {}).get("schemas", {})
     for error_schema in ["HTTPValidationError", "ValidationError"]:
         if error_schema in all_components and error_schema not in brain_schemas:
             brain_schemas[error_schema] = all_components[error_schema]
@@ -249,14 +250,32 @@ def normalize_contract(contract: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
-def compute_contract_hash(normalized_contract: Dict[str, Any]) -> str:
-    """Compute deterministic SHA256 hash of normalized contract.
+def serialize_contract(normalized_contract: Dict[str, Any]) -> bytes:
+    """Serialize a normalized contract to its canonical bytes.
+    
+    Sorted keys with 2-space indentation; the same bytes as
+    ``json.dumps(..., sort_keys=True, indent=2)`` for the ASCII-only
+    normalized contract, so hashes are unchanged.
     
     Args:
         normalized_contract: Normalized contract dictionary.
     
+    Returns:
+        Canonical JSON bytes (no trailing newline).
+    """
+    return orjson.dumps(normalized_contract, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+
+def compute_contract_hash(normalized_contract: Union[Dict[str, Any], bytes]) -> str:
+    """Compute deterministic SHA256 hash of normalized contract.
+    
+    Args:
+        normalized_contract: Normalized contract dictionary, or its bytes from
+            serialize_contract() when the caller already has them.
+    
     Returns:
         SHA256 hex digest of the contract.
     """
-    contract_json = json.dumps(normalized_contract, sort_keys=True, indent=2)
-    return hashlib.sha256(contract_json.encode()).hexdigest()
+    if not isinstance(normalized_contract, bytes):
+        normalized_contract = serialize_contract(normalized_contract)
+    return hashlib.sha256(normalized_contract).hexdigest()
@@ -14,6 +14,10 @@ DEFAULT_MODEL = "gpt-4o-mini"  # Cost-efficient, strong baseline
 DEFAULT_TIMEOUT = 60  # seconds
 DEFAULT_MAX_TOKENS = 4096
 
+# Deterministic token sequence streamed by the stub provider
+_STUB_STREAM_TOKENS = ("Echo", " Brain", " (stub)", ":", " streaming", " response", ".")
+_STUB_STREAM_CONTENT = "".join(_STUB_STREAM_TOKENS)
+
 
 class BrainProviderError(Exception):
     """Base exception for brain provider errors."""
@@ -83,20 +87,18 @@ class StubBrainProvider(BrainProvider):
         session_id = request.session_id or str(uuid.uuid4())
         
         # Emit token events
-        tokens = ["Echo", " Brain", " (stub)", ":", " streaming", " response", "."]
-        for token in tokens:
+        for token in _STUB_STREAM_TOKENS:
             yield {
                 "event": "token",
                 "data": {"token": token, "session_id": session_id}
             }
         
         # Emit final event
-        full_content = "".join(tokens)
         yield {
             "event": "final",
             "data": {
                 "session_id": session_id,
-                "message": {"role": "assistant", "content": full_content},
+                "message": {"role": "assistant", "content": _STUB_STREAM_CONTENT},
                 "usage": {"prompt_tokens": 10, "completion_tokens": 15, "total_tokens": 25}
             }
         }
@@ -0,0 +1,42 @@
+"""Pinned dependency versions that the Brain API contract snapshot depends on.
+
+The OpenAPI output (and therefore the contract hash) varies with the FastAPI
+and Pydantic versions, so the snapshot scripts check the installed versions
+against requirements.txt before writing anything.
+"""
+import re
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import Dict
+
+_PIN_RE = re.compile(rb'^[ \t]*(fastapi|pydantic)==([\d.]+)', re.IGNORECASE | re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def get_pinned_versions(requirements_path: Path) -> Dict[str, str]:
+    """Parse requirements.txt for the pinned fastapi/pydantic versions.
+    
+    Args:
+        requirements_path: Path to requirements.txt.
+    
+    Returns:
+        Mapping of lowercase package name to pinned version; empty if the
+        file does not exist.
+    """
+    if not requirements_path.exists():
+        return {}
+    data = requirements_path.read_bytes()
+    return {m.group(1).lower().decode(): m.group(2).decode() for m in _PIN_RE.finditer(data)}
+
+
+def get_installed_versions() -> Dict[str, str]:
+    """Return the installed fastapi/pydantic versions.
+    
+    Read from package metadata rather than ``__version__`` so that a version
+    mismatch is reported without importing either framework.
+    
+    Returns:
+        Mapping of package name to installed version.
+    """
+    return {"fastapi": version("fastapi"), "pydantic": version("pydantic")}
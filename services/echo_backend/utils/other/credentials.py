@@ -0,0 +1,36 @@
+import json
+import os
+import threading
+from typing import Optional
+
+CREDENTIALS_FILE = 'google-credentials.json'
+
+_service_account_info: Optional[dict] = None
+_credentials_file_written = False
+_lock = threading.Lock()
+
+
+def get_service_account_info() -> Optional[dict]:
+    """Return SERVICE_ACCOUNT_JSON parsed once per process, or None if unset."""
+    global _service_account_info
+    if _service_account_info is None:
+        raw = os.environ.get('SERVICE_ACCOUNT_JSON')
+        if not raw:
+            return None
+        _service_account_info = json.loads(raw)
+    return _service_account_info
+
+
+def ensure_credentials_file() -> None:
+    """Write SERVICE_ACCOUNT_JSON to disk if present; later calls are no-ops."""
+    global _credentials_file_written
+    if _credentials_file_written:
+        return
+    with _lock:
+        if _credentials_file_written:
+            return
+        service_account_info = get_service_account_info()
+        if service_account_info is not None:
+            with open(CREDENTIALS_FILE, 'w') as f:
+                json.dump(service_account_info, f)
+        _credentials_file_written = True
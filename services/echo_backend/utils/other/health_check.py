@@ -0,0 +1,57 @@
+# Probe paths answered directly, before routing, dependency injection or the timeout middleware
+_HEALTH_PATHS = frozenset(("/health", "/healthz", "/v1/health"))
+_WS_HEALTH_PATH = "/ws/health"
+
+_OK_BODY = b'{"status":"ok"}'
+_OK_TEXT = _OK_BODY.decode()
+_OK_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_OK_BODY)).encode()),
+)
+
+_NOT_ALLOWED_BODY = b'{"detail":"Method Not Allowed"}'
+_NOT_ALLOWED_HEADERS = (
+    (b"allow", b"GET, HEAD"),
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_NOT_ALLOWED_BODY)).encode()),
+)
+
+
+class HealthCheckInterceptor:
+    """Pure ASGI middleware that answers liveness probes with a prebuilt response.
+
+    Probes are the most frequent requests the service sees, so they skip the
+    router and any middleware installed inside this one. Middleware installed
+    outside it (CORS) still applies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket" and scope["path"] == _WS_HEALTH_PATH:
+            await self._ws_health(receive, send)
+            return
+        if scope["type"] != "http" or scope["path"] not in _HEALTH_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method == "GET" or method == "HEAD":
+            status, headers, body = 200, _OK_HEADERS, _OK_BODY
+        else:
+            status, headers, body = 405, _NOT_ALLOWED_HEADERS, _NOT_ALLOWED_BODY
+
+        # Fresh header list per response: outer middleware (CORS) appends to it in place
+        await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else body})
+
+    @staticmethod
+    async def _ws_health(receive, send):
+        """Accept, send one status frame and close (no auth)."""
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        await send({"type": "websocket.accept"})
+        await send({"type": "websocket.send", "text": _OK_TEXT})
+        await send({"type": "websocket.close", "code": 1000})
@@ -4,10 +4,13 @@ import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
+import msgspec
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers import chat, health, notes
+from app.routers.codec import decode_error_handler
+from app.services.external import close_http_client
 from app.services.notes_store import NotesStore
 
 # Configure structured logging
@@ -24,9 +27,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler."""
     logger.info("Starting Echo Backend")
     # Initialize notes store
-    app.state.notes_store = NotesStore()
-    await app.state.notes_store.initialize()
+    notes_store = NotesStore()
+    notes_store.initialize()
+    app.state.notes_store = notes_store
+    # Bind the store once so the notes dependency doesn't go through app.state
+    app.dependency_overrides[notes.get_notes_store] = lambda: notes_store
     yield
+    app.dependency_overrides.pop(notes.get_notes_store, None)
+    await close_http_client()
     logger.info("Shutting down Echo Backend")
 
 
@@ -46,6 +54,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request bodies are decoded with msgspec; surface decode errors as 422
+app.add_exception_handler(msgspec.DecodeError, decode_error_handler)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(chat.router)
@@ -1 +1 @@
-"""Pydantic models."""
+"""API models."""
@@ -1,28 +1,32 @@
 """Chat models."""
 
-from typing import Any
+from typing import Annotated, Any
 
-from pydantic import BaseModel, Field
+import msgspec
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(msgspec.Struct):
     """Chat request payload."""
 
-    session_id: str = Field(..., description="Unique session identifier")
-    user_text: str = Field(..., description="User's message text")
+    session_id: Annotated[str, msgspec.Meta(description="Unique session identifier")]
+    user_text: Annotated[str, msgspec.Meta(description="User's message text")]
 
 
-class Action(BaseModel):
+class Action(msgspec.Struct):
     """Action to be executed by the client."""
 
-    type: str = Field(..., description="Action type (e.g., 'create_note', 'send_email')")
-    payload: dict[str, Any] = Field(default_factory=dict, description="Action-specific data")
+    type: Annotated[
+        str, msgspec.Meta(description="Action type (e.g., 'create_note', 'send_email')")
+    ]
+    payload: Annotated[dict[str, Any], msgspec.Meta(description="Action-specific data")] = (
+        msgspec.field(default_factory=dict)
+    )
 
 
-class ChatResponse(BaseModel):
+class ChatResponse(msgspec.Struct):
     """Chat response payload."""
 
-    assistant_text: str = Field(..., description="Assistant's response text")
-    actions: list[Action] = Field(
-        default_factory=list, description="Actions for client to execute"
+    assistant_text: Annotated[str, msgspec.Meta(description="Assistant's response text")]
+    actions: Annotated[list[Action], msgspec.Meta(description="Actions for client to execute")] = (
+        msgspec.field(default_factory=list)
     )
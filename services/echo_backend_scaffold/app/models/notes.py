@@ -1,19 +1,20 @@
 """Notes models."""
 
 from datetime import datetime
+from typing import Annotated
 
-from pydantic import BaseModel, Field
+import msgspec
 
 
-class NoteCreate(BaseModel):
+class NoteCreate(msgspec.Struct):
     """Note creation payload."""
 
-    title: str = Field(..., min_length=1, max_length=200)
-    content: str = Field(default="")
-    tags: list[str] = Field(default_factory=list)
+    title: Annotated[str, msgspec.Meta(min_length=1, max_length=200)]
+    content: str = ""
+    tags: list[str] = msgspec.field(default_factory=list)
 
 
-class Note(BaseModel):
+class Note(msgspec.Struct):
     """Note response model."""
 
     id: str
@@ -24,7 +25,7 @@ class Note(BaseModel):
     updated_at: datetime
 
 
-class NoteList(BaseModel):
+class NoteList(msgspec.Struct):
     """List of notes response."""
 
     notes: list[Note]
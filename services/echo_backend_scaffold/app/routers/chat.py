@@ -2,31 +2,49 @@
 
 import logging
 
-from fastapi import APIRouter
+import msgspec
+from fastapi import APIRouter, Request, Response
 
 from app.models.chat import ChatRequest, ChatResponse
+from app.routers.codec import encode_response
 
 router = APIRouter(tags=["chat"])
 logger = logging.getLogger(__name__)
 
+# Compiled once so each request only pays for decoding
+_chat_request_decoder = msgspec.json.Decoder(ChatRequest)
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+# Constant parts of the deterministic stub reply
+_STUB_PREFIX = "Echo received: '"
+_STUB_SUFFIX = "'. This is a stub response. LLM integration coming in Phase 1."
+
+
+@router.post("/chat")
+async def chat(request: Request) -> Response:
     """Process a chat message.
 
     Currently returns a deterministic stub response.
     Will be connected to LLM in future phases.
     """
-    logger.info(
-        "Chat request received",
-        extra={"session_id": request.session_id, "text_length": len(request.user_text)},
-    )
+    chat_request = _chat_request_decoder.decode(await request.body())
+
+    # Skip building the extra dict when INFO is filtered out (typical in production)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Chat request received",
+            extra={
+                "session_id": chat_request.session_id,
+                "text_length": len(chat_request.user_text),
+            },
+        )
 
     # Deterministic stub response
     # In future: integrate with OpenAI/LLM service
-    assistant_text = f"Echo received: '{request.user_text}'. This is a stub response. LLM integration coming in Phase 1."
+    assistant_text = "".join((_STUB_PREFIX, chat_request.user_text, _STUB_SUFFIX))
 
-    return ChatResponse(
-        assistant_text=assistant_text,
-        actions=[],  # Actions will be populated by LLM in future phases
+    return encode_response(
+        ChatResponse(
+            assistant_text=assistant_text,
+            actions=[],  # Actions will be populated by LLM in future phases
+        )
     )
@@ -0,0 +1,25 @@
+"""msgspec JSON helpers shared by routers."""
+
+import msgspec
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+_encoder = msgspec.json.Encoder()
+
+
+def encode_response(content: object, status_code: int = 200) -> Response:
+    """Encode content straight to a JSON response."""
+    return Response(
+        content=_encoder.encode(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+async def decode_error_handler(_request: Request, exc: Exception) -> JSONResponse:
+    """Report malformed or invalid request bodies as 422.
+
+    Matches the status FastAPI uses for its own request validation.
+    msgspec.ValidationError is a DecodeError subclass, so both land here.
+    """
+    return JSONResponse(status_code=422, content={"detail": str(exc)})
@@ -3,53 +3,65 @@
 import logging
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from app.models.notes import Note, NoteCreate, NoteList
+from app.models.notes import NoteCreate, NoteList
+from app.routers.codec import encode_response
 from app.services.notes_store import NotesStore
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 logger = logging.getLogger(__name__)
 
+# Compiled once so each request only pays for decoding
+_note_create_decoder = msgspec.json.Decoder(NoteCreate)
+
 
 def get_notes_store(request: Request) -> NotesStore:
-    """Get notes store from app state."""
+    """Get notes store from app state.
+
+    Used as a FastAPI dependency. The app lifespan overrides it with the
+    store it created so requests skip the app-state lookup.
+    """
     store: Any = request.app.state.notes_store
     return store  # type: ignore[no-any-return]
 
 
-@router.post("", response_model=Note, status_code=201)
-async def create_note(note: NoteCreate, request: Request) -> Note:
+@router.post("", status_code=201)
+async def create_note(request: Request, store: NotesStore = Depends(get_notes_store)) -> Response:
     """Create a new note."""
-    store = get_notes_store(request)
-    created = await store.create(note)
-    logger.info("Note created", extra={"note_id": created.id})
-    return created
+    note = _note_create_decoder.decode(await request.body())
+    created = store.create(note)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Note created", extra={"note_id": created.id})
+    return encode_response(created, status_code=201)
 
 
-@router.get("", response_model=NoteList)
-async def list_notes(request: Request) -> NoteList:
-    """List all notes."""
-    store = get_notes_store(request)
-    notes = await store.list_all()
-    return NoteList(notes=notes, count=len(notes))
+@router.get("")
+async def list_notes(
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1),
+    store: NotesStore = Depends(get_notes_store),
+) -> Response:
+    """List notes, newest first, optionally paginated."""
+    notes = store.list_page(offset, limit)
+    return encode_response(NoteList(notes=notes, count=len(notes)))
 
 
-@router.get("/{note_id}", response_model=Note)
-async def get_note(note_id: str, request: Request) -> Note:
+@router.get("/{note_id}")
+async def get_note(note_id: str, store: NotesStore = Depends(get_notes_store)) -> Response:
     """Get a note by ID."""
-    store = get_notes_store(request)
-    note = await store.get(note_id)
+    note = store.get(note_id)
     if note is None:
         raise HTTPException(status_code=404, detail="Note not found")
-    return note
+    return encode_response(note)
 
 
 @router.delete("/{note_id}", status_code=204)
-async def delete_note(note_id: str, request: Request) -> None:
+async def delete_note(note_id: str, store: NotesStore = Depends(get_notes_store)) -> None:
     """Delete a note by ID."""
-    store = get_notes_store(request)
-    deleted = await store.delete(note_id)
+    deleted = store.delete(note_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Note not found")
-    logger.info("Note deleted", extra={"note_id": note_id})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Note deleted", extra={"note_id": note_id})
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 # Default timeout for external calls (seconds)
 DEFAULT_TIMEOUT = 10.0
 
+# Shared client so repeated calls reuse pooled keep-alive connections
+_client: httpx.AsyncClient | None = None
+
 
 class ExternalServiceError(Exception):
     """Raised when an external service call fails."""
@@ -21,6 +24,25 @@ class ExternalServiceError(Exception):
     pass
 
 
+async def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 async def call_external_api(
     url: str,
     method: str = "GET",
@@ -44,16 +66,17 @@ async def call_external_api(
     Raises:
         ExternalServiceError: If the call fails or times out.
     """
+    client = await get_http_client()
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_body,
-            )
-            response.raise_for_status()
-            return cast(dict[str, Any], response.json())
+        response = await client.request(
+            method=method,
+            url=url,
+            headers=headers,
+            json=json_body,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return cast(dict[str, Any], response.json())
     except httpx.TimeoutException as e:
         logger.error("External API timeout", extra={"url": url, "timeout": timeout})
         raise ExternalServiceError(f"Request timed out after {timeout}s") from e
@@ -77,7 +100,8 @@ async def web_search(query: str) -> dict[str, Any]:
 
     Will be integrated with a search API in future phases.
     """
-    logger.info("Web search placeholder called", extra={"query": query})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Web search placeholder called", extra={"query": query})
     return {
         "status": "placeholder",
         "message": "Web search not yet implemented",
@@ -90,10 +114,11 @@ async def send_email(to: str, subject: str, body: str) -> dict[str, Any]:
 
     Will be integrated with an email service in future phases.
     """
-    logger.info(
-        "Send email placeholder called",
-        extra={"to": to, "subject": subject, "body_length": len(body)},
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Send email placeholder called",
+            extra={"to": to, "subject": subject, "body_length": len(body)},
+        )
     return {
         "status": "placeholder",
         "message": "Email sending not yet implemented",
@@ -107,7 +132,8 @@ async def get_weather(location: str) -> dict[str, Any]:
 
     Will be integrated with a weather API in future phases.
     """
-    logger.info("Weather placeholder called", extra={"location": location})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Weather placeholder called", extra={"location": location})
     return {
         "status": "placeholder",
         "message": "Weather API not yet implemented",
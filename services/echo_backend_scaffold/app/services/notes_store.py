@@ -2,6 +2,7 @@
 
 import uuid
 from datetime import UTC, datetime
+from itertools import islice
 
 from app.models.notes import Note, NoteCreate
 
@@ -14,14 +15,20 @@ class NotesStore:
     """
 
     def __init__(self) -> None:
+        # Insertion order is creation order, so reversing the dict yields
+        # newest-first without re-sorting on every read.
         self._notes: dict[str, Note] = {}
 
-    async def initialize(self) -> None:
-        """Initialize the store."""
+    def initialize(self) -> None:
+        """Initialize the store.
+
+        Methods are plain (non-async) while storage is in-memory; reintroduce
+        async only on methods that end up awaiting real I/O.
+        """
         # In future: initialize database connection
         pass
 
-    async def create(self, note_create: NoteCreate) -> Note:
+    def create(self, note_create: NoteCreate) -> Note:
         """Create a new note."""
         now = datetime.now(UTC)
         note = Note(
@@ -35,19 +42,20 @@ class NotesStore:
         self._notes[note.id] = note
         return note
 
-    async def get(self, note_id: str) -> Note | None:
+    def get(self, note_id: str) -> Note | None:
         """Get a note by ID."""
         return self._notes.get(note_id)
 
-    async def list_all(self) -> list[Note]:
+    def list_all(self) -> list[Note]:
         """List all notes, sorted by creation time (newest first)."""
-        return sorted(
-            self._notes.values(),
-            key=lambda n: n.created_at,
-            reverse=True,
-        )
+        return list(reversed(self._notes.values()))
+
+    def list_page(self, offset: int = 0, limit: int | None = None) -> list[Note]:
+        """List a page of notes, newest first, without materializing the rest."""
+        stop = None if limit is None else offset + limit
+        return list(islice(reversed(self._notes.values()), offset, stop))
 
-    async def delete(self, note_id: str) -> bool:
+    def delete(self, note_id: str) -> bool:
         """Delete a note. Returns True if deleted, False if not found."""
         if note_id in self._notes:
             del self._notes[note_id]
@@ -15,7 +15,7 @@ async def client() -> AsyncGenerator[AsyncClient, None]:
     """Create async test client with fresh state."""
     # Reset app state for test isolation
     app.state.notes_store = NotesStore()
-    await app.state.notes_store.initialize()
+    app.state.notes_store.initialize()
 
     transport: Any = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
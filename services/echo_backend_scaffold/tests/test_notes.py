@@ -41,6 +41,20 @@ async def test_list_notes(client: AsyncClient) -> None:
     assert isinstance(data["notes"], list)
 
 
+@pytest.mark.asyncio
+async def test_list_notes_paginated(client: AsyncClient) -> None:
+    """Test listing notes newest first with offset/limit."""
+    for i in range(3):
+        await client.post("/notes", json={"title": f"Page Note {i}"})
+
+    response = await client.get("/notes", params={"offset": 1, "limit": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 1
+    assert [n["title"] for n in data["notes"]] == ["Page Note 1"]
+
+
 @pytest.mark.asyncio
 async def test_get_note(client: AsyncClient) -> None:
     """Test getting a note by ID."""